@@ -5,22 +5,94 @@ Stage 1: Collecting jobs using api instead of web scraping
 """
 
 import requests
-import json
-import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+import csv
+import orjson
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import pandas as pd
+from itertools import islice
 
 class SimpleAPICollector:
-    def __init__(self, location="St. Louis, MO", keywords="computer science"):
+    def __init__(self, location="St. Louis, MO", keywords="computer science", verbose=False):
         self.location = location
         self.keywords = keywords
+        self.verbose = verbose  # print every job as it's found
         self.jobs = []
+        
+        # (title, company) pairs we already have, so duplicates are skipped
+        # as jobs come in (the lock is because the APIs run at the same time)
+        self._seen = set()
+        self._lock = threading.Lock()
+        
+        # While collect_all_jobs is running, status lines are saved here and
+        # written out together at the end (None means print right away)
+        self._log = None
+        
+        # Split and lowercase the keywords once so we don't redo it later
+        self._keyword_tokens = tuple(keyword.lower() for keyword in keywords.split())
+        
+        # Compile the keyword check once instead of redoing it for every job
+        # ((?!) never matches, same as having no keywords to look for)
+        keyword_regex = '|'.join(re.escape(keyword) for keyword in self._keyword_tokens)
+        self._keyword_pattern = re.compile(keyword_regex or r'(?!)', re.IGNORECASE)
+        
+        # One session for every API call so connections get reused
+        # instead of doing a new TLS handshake each time
+        self.session = requests.Session()
+        retries = Retry(total=2, backoff_factor=0.3,
+                        status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # Always ask for compressed JSON (RemoteOK's full list is several MB).
+        # urllib3 only lists br/zstd here if it can actually decode them
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """
+        Close the HTTP session when we're done with the APIs
+        """
+        self.session.close()
+    
+    def _status(self, message):
+        """
+        Print a status message, or save it for later during collect_all_jobs
+        """
+        if self._log is None:
+            print(message)
+        else:
+            self._log.append(message)
+    
+    def _add_jobs(self, found_jobs):
+        """
+        Add a batch of jobs, skipping any with a title + company we already have
+        """
+        new_jobs = []
+        with self._lock:
+            for job_data in found_jobs:
+                identifier = (job_data['title'].lower(), job_data['company'].lower())
+                if identifier not in self._seen:
+                    self._seen.add(identifier)
+                    new_jobs.append(job_data)
+            self.jobs.extend(new_jobs)
     
     def get_jobs_from_usajobs(self):
         """
         Get government jobs from USAJobs.gov (no API key needed!)
         """
-        print("Getting government jobs from USAJobs.gov...")
+        self._status("Getting government jobs from USAJobs.gov...")
         
         url = "https://data.usajobs.gov/api/search"
         
@@ -37,44 +109,51 @@ class SimpleAPICollector:
         }
         
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=15)
-            data = response.json()
+            response = self.session.get(url, headers=headers, params=params, timeout=15)
+            data = orjson.loads(response.content)
             
             if 'SearchResult' in data and 'SearchResultItems' in data['SearchResult']:
-                jobs_found = 0
+                # Every job from this request was scraped at the same time
+                scraped_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                found_jobs = []
                 for item in data['SearchResult']['SearchResultItems']:
                     job_info = item.get('MatchedObjectDescriptor', {})
                     
+                    # Most jobs only have one location, so skip the join for those
+                    locations = job_info.get('PositionLocation') or ()
+                    if len(locations) == 1:
+                        location = locations[0].get('LocationName', '')
+                    else:
+                        location = ', '.join(loc.get('LocationName', '') for loc in locations)
+                    
                     # Extract job details
                     job_data = {
                         'title': job_info.get('PositionTitle', 'No Title'),
                         'company': job_info.get('OrganizationName', 'U.S. Government'),
-                        'location': ', '.join([loc.get('LocationName', '') for loc in job_info.get('PositionLocation', [])]),
+                        'location': location,
                         'description': job_info.get('UserArea', {}).get('Details', {}).get('JobSummary', 'No Description'),
                         'url': job_info.get('PositionURI', 'No URL'),
                         'source': 'USAJobs',
-                        'scraped_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                        'scraped_date': scraped_date
                     }
                     
-                    self.jobs.append(job_data)
-                    jobs_found += 1
-                    print(f"Found: {job_data['title']} at {job_data['company']}")
+                    found_jobs.append(job_data)
+                    if self.verbose:
+                        self._status(f"Found: {job_data['title']} at {job_data['company']}")
                 
-                print(f"Got {jobs_found} government jobs")
+                self._add_jobs(found_jobs)
+                self._status(f"Got {len(found_jobs)} government jobs")
             else:
-                print("No government jobs found")
+                self._status("No government jobs found")
                 
         except Exception as e:
-            print(f"Error getting USAJobs data: {e}")
-        
-        # Be nice to the API
-        time.sleep(1)
+            self._status(f"Error getting USAJobs data: {e}")
     
     def get_remote_jobs(self):
         """
         Get remote jobs from RemoteOK (no API key needed!)
         """
-        print("Getting remote jobs from RemoteOK...")
+        self._status("Getting remote jobs from RemoteOK...")
         
         url = "https://remoteok.io/api"
         
@@ -83,48 +162,48 @@ class SimpleAPICollector:
         }
         
         try:
-            response = requests.get(url, headers=headers, timeout=15)
-            data = response.json()
+            response = self.session.get(url, headers=headers, timeout=15)
+            data = orjson.loads(response.content)
             
-            # Skip the first item (it's just metadata)
-            remote_jobs = data[1:] if len(data) > 1 else []
+            # Skip the first item (it's just metadata) without copying
+            # the rest of the list, since we usually stop after 10 matches
+            remote_jobs = islice(data, 1, None)
             
-            jobs_found = 0
+            scraped_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            found_jobs = []
             for job in remote_jobs:
-                if isinstance(job, dict):
-                    # Check if this job matches our keywords
-                    title = job.get('position', '').lower()
-                    description = job.get('description', '').lower()
+                # Check if this job matches our keywords (anything that isn't
+                # a job dict has no .get, so just skip it)
+                try:
+                    matches = (self._keyword_pattern.search(job.get('position', '')) or
+                               self._keyword_pattern.search(job.get('description', '')))
+                except AttributeError:
+                    continue
+                
+                if matches:
+                    job_data = {
+                        'title': job.get('position', 'No Title'),
+                        'company': job.get('company', 'No Company'),
+                        'location': 'Remote',
+                        'description': job.get('description', 'No Description'),
+                        'url': job.get('url', 'No URL'),
+                        'source': 'RemoteOK',
+                        'scraped_date': scraped_date
+                    }
+                    
+                    found_jobs.append(job_data)
+                    if self.verbose:
+                        self._status(f"Found: {job_data['title']} at {job_data['company']}")
                     
-                    # Simple keyword matching
-                    if any(keyword.lower() in title + ' ' + description 
-                           for keyword in self.keywords.split()):
-                        
-                        job_data = {
-                            'title': job.get('position', 'No Title'),
-                            'company': job.get('company', 'No Company'),
-                            'location': 'Remote',
-                            'description': job.get('description', 'No Description'),
-                            'url': job.get('url', 'No URL'),
-                            'source': 'RemoteOK',
-                            'scraped_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        }
-                        
-                        self.jobs.append(job_data)
-                        jobs_found += 1
-                        print(f"Found: {job_data['title']} at {job_data['company']}")
-                        
-                        # Limit to 10 remote jobs so we don't get too many
-                        if jobs_found >= 10:
-                            break
+                    # Limit to 10 remote jobs so we don't get too many
+                    if len(found_jobs) >= 10:
+                        break
             
-            print(f"Got {jobs_found} remote jobs")
+            self._add_jobs(found_jobs)
+            self._status(f"Got {len(found_jobs)} remote jobs")
             
         except Exception as e:
-            print(f"Error getting RemoteOK data: {e}")
-        
-        # Be nice to the API
-        time.sleep(2)
+            self._status(f"Error getting RemoteOK data: {e}")
     
     def get_jobs_with_rapidapi(self, api_key):
         """
@@ -132,11 +211,11 @@ class SimpleAPICollector:
         Sign up at: https://rapidapi.com/letscrape-6bRBa3QguO5/api/jsearch
         """
         if not api_key or api_key == "your_api_key_here":
-            print("Skipping RapidAPI - no API key provided")
-            print("Get a free API key at: https://rapidapi.com/")
+            self._status("Skipping RapidAPI - no API key provided")
+            self._status("Get a free API key at: https://rapidapi.com/")
             return
         
-        print("Getting jobs from RapidAPI JSearch...")
+        self._status("Getting jobs from RapidAPI JSearch...")
         
         url = "https://jsearch.p.rapidapi.com/search"
         
@@ -145,19 +224,30 @@ class SimpleAPICollector:
             "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
         }
         
-        params = {
-            "query": f"{self.keywords} in {self.location}",
-            "page": "1",
-            "num_pages": "2"
-        }
+        # Ask for each page separately and fetch them at the same time,
+        # instead of num_pages=2 where JSearch gets both pages before answering
+        pages = ["1", "2"]
+        
+        def fetch_page(page):
+            params = {
+                "query": f"{self.keywords} in {self.location}",
+                "page": page,
+                "num_pages": "1"
+            }
+            response = self.session.get(url, headers=headers, params=params, timeout=15)
+            return orjson.loads(response.content).get('data') or []
         
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=15)
-            data = response.json()
+            with ThreadPoolExecutor(max_workers=len(pages)) as executor:
+                page_results = list(executor.map(fetch_page, pages))
+            
+            # Put the pages back together in order
+            data = [job for page_jobs in page_results for job in page_jobs]
             
-            if 'data' in data and data['data']:
-                jobs_found = 0
-                for job in data['data']:
+            if data:
+                scraped_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                found_jobs = []
+                for job in data:
                     job_data = {
                         'title': job.get('job_title', 'No Title'),
                         'company': job.get('employer_name', 'No Company'),
@@ -165,54 +255,55 @@ class SimpleAPICollector:
                         'description': job.get('job_description', 'No Description'),
                         'url': job.get('job_apply_link', 'No URL'),
                         'source': 'RapidAPI',
-                        'scraped_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                        'scraped_date': scraped_date
                     }
                     
-                    self.jobs.append(job_data)
-                    jobs_found += 1
-                    print(f"Found: {job_data['title']} at {job_data['company']}")
+                    found_jobs.append(job_data)
+                    if self.verbose:
+                        self._status(f"Found: {job_data['title']} at {job_data['company']}")
                 
-                print(f"Got {jobs_found} jobs from RapidAPI")
+                self._add_jobs(found_jobs)
+                self._status(f"Got {len(found_jobs)} jobs from RapidAPI")
             else:
-                print("No jobs found from RapidAPI")
+                self._status("No jobs found from RapidAPI")
                 
         except Exception as e:
-            print(f"Error getting RapidAPI data: {e}")
-        
-        # Be nice to the API
-        time.sleep(1)
+            self._status(f"Error getting RapidAPI data: {e}")
     
     def collect_all_jobs(self, rapidapi_key=None):
         """
         Collect jobs from all available APIs
         """
         print("Starting API job collection...")
-        print(f"Looking for '{self.keywords}' jobs in {self.location}")
-        print("-" * 50)
-        
-        # Get government jobs (always works, no API key needed)
-        self.get_jobs_from_usajobs()
-        
-        # Get remote jobs (no API key needed)
-        self.get_remote_jobs()
-        
-        # Get jobs from RapidAPI (if API key provided)
-        if rapidapi_key:
-            self.get_jobs_with_rapidapi(rapidapi_key)
-        
-        # Remove duplicates (simple check by title + company)
-        unique_jobs = []
-        seen = set()
-        
-        for job in self.jobs:
-            identifier = (job['title'].lower(), job['company'].lower())
-            if identifier not in seen:
-                seen.add(identifier)
-                unique_jobs.append(job)
-        
-        self.jobs = unique_jobs
-        print("-" * 50)
-        print(f"Total unique jobs collected: {len(self.jobs)}")
+        self._log = []
+        try:
+            self._status(f"Looking for '{self.keywords}' jobs in {self.location}")
+            self._status("-" * 50)
+            
+            # Each API is a different site, so there's no need to wait on one
+            # before asking the next - run them all at the same time
+            fetchers = [
+                self.get_jobs_from_usajobs,  # government jobs (no API key needed)
+                self.get_remote_jobs  # remote jobs (no API key needed)
+            ]
+            
+            # Get jobs from RapidAPI (if API key provided)
+            if rapidapi_key:
+                fetchers.append(lambda: self.get_jobs_with_rapidapi(rapidapi_key))
+            
+            with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+                futures = [executor.submit(fetch) for fetch in fetchers]
+                for future in futures:
+                    future.result()
+            
+            # Duplicates (same title + company) were already skipped by _add_jobs
+            self._status("-" * 50)
+            self._status(f"Total unique jobs collected: {len(self.jobs)}")
+        finally:
+            # Write all the status lines at once, and go back to printing right
+            # away even if one of the APIs blew up
+            sys.stdout.write('\n'.join(self._log) + '\n')
+            self._log = None
         
         return self.jobs
     
@@ -224,20 +315,24 @@ class SimpleAPICollector:
             print("No jobs to save!")
             return
         
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
         # Save to CSV
         try:
-            df = pd.DataFrame(self.jobs)
-            csv_filename = f"api_jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            df.to_csv(csv_filename, index=False)
+            csv_filename = f"api_jobs_{timestamp}.csv"
+            with open(csv_filename, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=self.jobs[0].keys(), lineterminator='\n')
+                writer.writeheader()
+                writer.writerows(self.jobs)
             print(f"Saved to {csv_filename}")
         except Exception as e:
             print(f"Error saving CSV: {e}")
         
         # Save to JSON
         try:
-            json_filename = f"api_jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(json_filename, 'w') as f:
-                json.dump(self.jobs, f, indent=2)
+            json_filename = f"api_jobs_{timestamp}.json"
+            with open(json_filename, 'wb') as f:
+                f.write(orjson.dumps(self.jobs, option=orjson.OPT_INDENT_2))
             print(f"Saved to {json_filename}")
         except Exception as e:
             print(f"Error saving JSON: {e}")
@@ -281,6 +376,7 @@ def main():
     
     # Collect jobs
     jobs = collector.collect_all_jobs(rapidapi_key)
+    collector.close()
     
     if jobs:
         # Show sample jobs
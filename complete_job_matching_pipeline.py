@@ -5,14 +5,29 @@ Runs the complete pipeline using existing modules from the GitHub repository
 """
 
 import os
+import re
 import sys
+import gc
 import json
+import argparse
+import hashlib
+import threading
 import time
+
+# Only use the CPUs this process is actually allowed to run on (containers often
+# get fewer than os.cpu_count()), and tell the BLAS / OpenMP thread pools the same
+# thing before numpy and torch are imported so they don't oversubscribe
+CPU_COUNT = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+os.environ.setdefault('OMP_NUM_THREADS', str(CPU_COUNT))
+os.environ.setdefault('MKL_NUM_THREADS', str(CPU_COUNT))
+os.environ.setdefault('OPENBLAS_NUM_THREADS', str(CPU_COUNT))
+
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
-from scipy.spatial.distance import cosine
 
 # Import existing modules from the repository
 try:
@@ -20,13 +35,88 @@ try:
     from api_scraper import SimpleAPICollector
     from data_validator import SimpleDataChecker
     from embedding_generator import LLMEmbeddingGenerator
+    from job_matcher import quantize_embeddings, cuda_cosine_similarities, blocked_dot, GPU_MIN_JOBS
     from config import *
 except ImportError as e:
     print(f"Error importing modules: {e}")
     print("Make sure all required files are in the same directory!")
-    print("Required files: job_scraper.py, api_scraper.py, data_validator.py, embedding_generator.py, config.py")
+    print("Required files: job_scraper.py, api_scraper.py, data_validator.py, data_loader.py, embedding_generator.py, job_matcher.py, config.py")
     sys.exit(1)
 
+
+# Text cleaning patterns, compiled once
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Stage 2 only cleans in parallel processes above this many jobs
+PARALLEL_CLEAN_MIN_JOBS = 5000
+
+
+@lru_cache(maxsize=8)
+def _read_resume_file(file_path, mtime, size):
+    """
+    Read resume text from a .txt, .pdf or .docx file
+    mtime and size are only there so the cache notices when the file changes
+    """
+    if file_path.endswith('.txt'):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    if file_path.endswith('.pdf'):
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            raise ImportError("PDF resumes need pypdf (pip install pypdf)")
+        return "\n".join(page.extract_text() or "" for page in PdfReader(file_path).pages)
+    
+    if file_path.endswith('.docx'):
+        try:
+            import docx
+        except ImportError:
+            raise ImportError("Word resumes need python-docx (pip install python-docx)")
+        return "\n".join(paragraph.text for paragraph in docx.Document(file_path).paragraphs)
+    
+    raise ValueError(f"Unsupported resume file type: {file_path}")
+
+
+def clean_text_column(values):
+    """
+    Same cleaning as _clean_text, but over a whole column with pandas
+    """
+    values = pd.Series(values, dtype=object)
+    values = values.where(values.notna() & values.astype(bool), '').astype(str)
+    
+    # Remove HTML tags (only rows that have a '<' can contain any)
+    has_tags = values.str.contains('<', regex=False)
+    if has_tags.any():
+        values[has_tags] = values[has_tags].str.replace(_HTML_TAG_RE, ' ', regex=True)
+    
+    # Remove extra whitespace
+    values = values.str.replace(_WHITESPACE_RE, ' ', regex=True)
+    
+    return values.str.strip()
+
+
+def _clean_text_columns_parallel(columns):
+    """
+    Clean several text columns by splitting them into chunks across CPU cores
+    """
+    workers = CPU_COUNT
+    chunks = []
+    for field, values in columns.items():
+        size = -(-len(values) // workers)  # ceiling division
+        for start in range(0, len(values), size):
+            chunks.append((field, values[start:start + size]))
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(clean_text_column, [values for _, values in chunks])
+        cleaned = {field: [] for field in columns}
+        for (field, _), result in zip(chunks, results):
+            cleaned[field].append(result)
+    
+    return {field: pd.concat(parts, ignore_index=True) for field, parts in cleaned.items()}
+
+
 class CompleteJobMatchingPipeline:
     """
     Complete job matching pipeline integrating all stages
@@ -44,16 +134,25 @@ class CompleteJobMatchingPipeline:
         # Initialize components
         self.jobs = []
         self.processed_jobs = []
-        self.job_embeddings = []
+        self.processed_df = None  # same jobs as processed_jobs, as a DataFrame
+        self.job_embeddings = np.empty((0, 0), dtype=np.int8)  # one row per processed job
+        self.job_norms = None
         self.resume_text = ""
         self.resume_embedding = None
-        self.similarity_scores = []
-        self.top_matches = []
+        self.similarity_scores = np.empty(0, dtype=np.float32)  # one score per processed job
+        self.top_matches = np.empty(0, dtype=np.intp)  # indexes into processed_jobs, best first
         
-        # Initialize embedding generator
+        # Initialize embedding generator (torch only gets imported from here on,
+        # so --help or answering "n" at the prompt stays quick - the generator
+        # sets torch's thread count itself before loading the model)
+        self._warmup_thread = None
         try:
             self.embedding_generator = LLMEmbeddingGenerator()
             print(f"Initialized LLM embedding generator")
+            
+            # warm the model up in the background while Stage 1 waits on the network
+            self._warmup_thread = threading.Thread(target=self.embedding_generator.warmup, daemon=True)
+            self._warmup_thread.start()
         except Exception as e:
             print(f"Warning: Could not initialize embedding generator: {e}")
             self.embedding_generator = None
@@ -72,20 +171,24 @@ class CompleteJobMatchingPipeline:
         
         start_time = time.time()
         
-        # Web scraping
-        print("Step 1a: Web Scraping...")
+        # Web scraping and API collection are both waiting on the network,
+        # so run them at the same time
+        print("Step 1a: Web Scraping and API Collection (running together)...")
         scraper = SimpleJobScraper(location=self.location, keywords=self.keywords)
-        scraped_jobs = scraper.scrape_indeed(max_pages=MAX_PAGES_TO_SCRAPE)
-        print(f"Scraped {len(scraped_jobs)} jobs from Indeed")
         
-        # API collection
-        print("\nStep 1b: API Collection...")
-        collector = SimpleAPICollector(location=self.location, keywords=self.keywords)
-        api_jobs = collector.collect_all_jobs()
+        # the collector closes its HTTP session on the way out, even if a future raised
+        with SimpleAPICollector(location=self.location, keywords=self.keywords) as collector, \
+                ThreadPoolExecutor(max_workers=2) as executor:
+            scrape_future = executor.submit(scraper.scrape_indeed, max_pages=MAX_PAGES_TO_SCRAPE)
+            api_future = executor.submit(collector.collect_all_jobs)
+            scraped_jobs = scrape_future.result()
+            api_jobs = api_future.result()
+        
+        print(f"\nScraped {len(scraped_jobs)} jobs from Indeed")
         print(f"Collected {len(api_jobs)} jobs from APIs")
         
         # Combine and remove duplicates
-        print("\nStep 1c: Combining and deduplicating...")
+        print("\nStep 1b: Combining and deduplicating...")
         all_jobs = scraped_jobs + api_jobs
         self.jobs = self._remove_duplicates(all_jobs)
         
@@ -94,7 +197,7 @@ class CompleteJobMatchingPipeline:
         raw_filename = f"raw_jobs_{timestamp}.csv"
         if self.jobs:
             df = pd.DataFrame(self.jobs)
-            df.to_csv(raw_filename, index=False)
+            df.to_csv(raw_filename, index=False, lineterminator='\n')
             print(f"Saved {len(self.jobs)} unique jobs to {raw_filename}")
         
         stage1_time = time.time() - start_time
@@ -119,12 +222,9 @@ class CompleteJobMatchingPipeline:
         
         # Process job data
         print("Step 2a: Processing and cleaning job data...")
-        self.processed_jobs = []
-        
-        for i, job in enumerate(self.jobs):
-            processed_job = self._clean_job_data(job)
-            if self._is_valid_job(processed_job):
-                self.processed_jobs.append(processed_job)
+        df = self._clean_job_data(self.jobs)
+        self.processed_df = df[self._is_valid_job(df)].reset_index(drop=True)
+        self.processed_jobs = self.processed_df.to_dict('records')
         
         print(f"Processed {len(self.processed_jobs)} valid jobs out of {len(self.jobs)}")
         
@@ -143,8 +243,8 @@ class CompleteJobMatchingPipeline:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         processed_filename = f"processed_jobs_{timestamp}.csv"
         if self.processed_jobs:
-            df = pd.DataFrame(self.processed_jobs)
-            df.to_csv(processed_filename, index=False)
+            # write the cleaned DataFrame we already have instead of rebuilding it
+            self.processed_df.to_csv(processed_filename, index=False, lineterminator='\n')
             print(f"Saved processed data to {processed_filename}")
         
         # Run data quality check
@@ -176,47 +276,68 @@ class CompleteJobMatchingPipeline:
             print("Error: Embedding generator not available.")
             return False
         
-        # Save processed jobs to temporary CSV for embedding generator
-        temp_csv = "temp_jobs_for_embedding.csv"
-        df = pd.DataFrame(self.processed_jobs)
-        df.to_csv(temp_csv, index=False)
+        # make sure the background warm-up is done before using the model
+        self._wait_for_warmup()
+        
+        # Reuse job embeddings from an earlier run if the jobs haven't changed
+        cache_file = self._embedding_cache_file()
+        cached = os.path.exists(cache_file)
         
-        # Load job data into embedding generator
+        # Load job data into embedding generator (the saved embeddings list these jobs either way)
         print("Step 3a: Loading job data into embedding generator...")
-        if not self.embedding_generator.load_job_data(temp_csv):
+        if not self.embedding_generator.load_job_data_from_records(self.processed_jobs):
             print("Error: Could not load job data into embedding generator")
             return False
         
-        # Generate job embeddings
-        print("Step 3b: Generating job embeddings...")
-        if not self.embedding_generator.embed_all_jobs():
-            print("Error: Could not generate job embeddings")
-            return False
-        
-        # Extract embeddings from the generator
-        self.job_embeddings = []
-        for item in self.embedding_generator.embeddings:
-            self.job_embeddings.append(item['embedding'])
+        if cached:
+            print(f"Loading cached job embeddings from {cache_file}...")
+            self.job_embeddings = np.load(cache_file, mmap_mode='r')
+            os.utime(cache_file)  # counts as recently used, so it isn't the next one cleaned up
+        else:
+            # Generate job embeddings (the resume goes through the model in the same batches)
+            print("Step 3b: Generating job and resume embeddings...")
+            if not self.embedding_generator.embed_all_jobs(resume_text=self.resume_text):
+                print("Error: Could not generate job embeddings")
+                return False
+            
+            # Extract embeddings from the generator and keep them as int8 -
+            # a quarter of the float32 size, cosine scores move by less than 1e-3
+            self.job_embeddings = quantize_embeddings(self.embedding_generator.embedding_matrix)
+            self._save_embedding_cache(cache_file)
+        
+        # Each int8 row has its own scale - work out their lengths once here
+        # so Stage 4 is a single matrix-vector product
+        self.job_norms = np.sqrt(np.einsum('ij,ij->i', self.job_embeddings, self.job_embeddings,
+                                           dtype=np.float32, casting='unsafe'))
+        
+        if cached:
+            # unit-length float32 rows again, so the generator can save them like fresh ones
+            matrix = np.asarray(self.job_embeddings, dtype=np.float32)
+            matrix /= np.maximum(self.job_norms, 1e-12)[:, None]
+            self.embedding_generator.set_job_embeddings(matrix)
         
         print(f"Generated {len(self.job_embeddings)} job embeddings")
         
-        # Generate resume embedding
-        print("Step 3c: Generating resume embedding...")
-        if not self.embedding_generator.embed_resume(self.resume_text):
-            print("Error: Could not generate resume embedding")
-            return False
+        # Generate resume embedding (already done above unless the jobs came from the cache)
+        if cached:
+            print("Step 3c: Generating resume embedding...")
+            if not self.embedding_generator.embed_resume(self.resume_text):
+                print("Error: Could not generate resume embedding")
+                return False
         
-        self.resume_embedding = self.embedding_generator.resume_embedding
+        # normalize the resume once too
+        self.resume_embedding = np.asarray(self.embedding_generator.resume_embedding, dtype=np.float32)
+        self.resume_embedding /= np.linalg.norm(self.resume_embedding) + 1e-12
         print("Resume embedding generated successfully")
         
         # Save embeddings using the generator's method
         self.embedding_generator.save_embeddings()
         
-        # Clean up temporary file
-        try:
-            os.remove(temp_csv)
-        except:
-            pass
+        # The generator's copies of the jobs and their embeddings (plus the
+        # per-job metadata) aren't needed after this
+        self.embedding_generator.embeddings = []
+        self.embedding_generator.embedding_matrix = None
+        self.embedding_generator.job_data = None
         
         stage3_time = time.time() - start_time
         print(f"\nStage 3 completed in {stage3_time:.1f} seconds")
@@ -234,65 +355,52 @@ class CompleteJobMatchingPipeline:
         
         start_time = time.time()
         
-        if not self.job_embeddings or self.resume_embedding is None:
+        if len(self.job_embeddings) == 0 or self.resume_embedding is None:
             print("Error: No embeddings available. Run Stage 3 first.")
             return False
         
         print("Step 4a: Calculating cosine similarities...")
-        self.similarity_scores = []
-        
-        resume_emb = np.array(self.resume_embedding)
-        
-        for i, job_embedding in enumerate(self.job_embeddings):
-            try:
-                job_emb = np.array(job_embedding)
-                
-                # Calculate cosine similarity (1 - cosine distance)
-                similarity = 1 - cosine(resume_emb, job_emb)
-                
-                self.similarity_scores.append({
-                    'job_index': i,
-                    'similarity_score': similarity,
-                    'job_data': self.processed_jobs[i]
-                })
-                
-            except Exception as e:
-                print(f"Error calculating similarity for job {i}: {e}")
-                self.similarity_scores.append({
-                    'job_index': i,
-                    'similarity_score': 0.0,
-                    'job_data': self.processed_jobs[i]
-                })
+        
+        # Big job sets go to the GPU if there is one
+        scores = None
+        if len(self.job_embeddings) >= GPU_MIN_JOBS:
+            scores = cuda_cosine_similarities(self.job_embeddings, self.resume_embedding)
+        
+        if scores is None:
+            # Everything was normalized in Stage 3, so cosine similarity is just one
+            # matrix-vector product (divided by the stored int8 row lengths). The int8
+            # matrix (memory-mapped when it came from the cache) is converted a block at a time
+            scores = blocked_dot(self.job_embeddings, self.resume_embedding) / (self.job_norms + 1e-12)
+        
+        self.similarity_scores = scores
         
         print(f"Calculated similarities for {len(self.similarity_scores)} jobs")
         
-        # Sort by similarity score (descending)
+        # Only sort the top_n best scores instead of the whole list
         print("Step 4b: Ranking jobs by similarity...")
-        self.similarity_scores.sort(key=lambda x: x['similarity_score'], reverse=True)
+        top_n = min(top_n, len(scores))
+        if top_n < len(scores):
+            top_idx = np.argpartition(-scores, top_n)[:top_n]
+        else:
+            top_idx = np.arange(len(scores))
+        top_idx = top_idx[np.argsort(-scores[top_idx], kind='stable')]
         
-        # Get top matches
-        self.top_matches = self.similarity_scores[:top_n]
+        # Top matches are just job indexes, best first
+        self.top_matches = top_idx
         
         # Save results
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         results_file = f"job_matches_{timestamp}.csv"
         
-        match_data = []
-        for i, match in enumerate(self.top_matches):
-            job = match['job_data']
-            match_data.append({
-                'rank': i + 1,
-                'similarity_score': round(match['similarity_score'], 4),
-                'title': job['title'],
-                'company': job['company'],
-                'location': job['location'],
-                'source': job['source'],
-                'url': job.get('url', ''),
-                'description_preview': job['description'][:200] + "..." if len(job['description']) > 200 else job['description']
-            })
-        
-        df_matches = pd.DataFrame(match_data)
-        df_matches.to_csv(results_file, index=False)
+        # build the results table column-wise from the processed jobs
+        df_matches = self.processed_df.iloc[top_idx][['title', 'company', 'location', 'source', 'url']]
+        df_matches.insert(0, 'rank', np.arange(1, len(top_idx) + 1))
+        df_matches.insert(1, 'similarity_score', np.round(scores[top_idx].astype(np.float64), 4))
+        descriptions = self.processed_df['description'].iloc[top_idx]
+        df_matches['description_preview'] = descriptions.where(
+            descriptions.str.len() <= 200, descriptions.str.slice(0, 200) + "..."
+        )
+        df_matches.to_csv(results_file, index=False, lineterminator='\n')
         print(f"Saved top {len(self.top_matches)} matches to {results_file}")
         
         stage4_time = time.time() - start_time
@@ -308,16 +416,16 @@ class CompleteJobMatchingPipeline:
         print("FINAL RESULTS")
         print("="*70)
         
-        if not self.top_matches:
+        if len(self.top_matches) == 0:
             print("No matches found.")
             return
         
         print(f"\nTop {len(self.top_matches)} Job Matches:")
         print("-" * 70)
         
-        for i, match in enumerate(self.top_matches):
-            job = match['job_data']
-            score = match['similarity_score']
+        for i, job_index in enumerate(self.top_matches):
+            job = self.processed_jobs[job_index]
+            score = self.similarity_scores[job_index]
             
             print(f"\n{i+1}. {job['title']}")
             print(f"   Company: {job['company']}")
@@ -330,16 +438,18 @@ class CompleteJobMatchingPipeline:
             print("-" * 50)
         
         # Summary statistics
-        scores = [match['similarity_score'] for match in self.similarity_scores]
+        scores = self.similarity_scores
         print(f"\nSummary Statistics:")
         print(f"  Total jobs analyzed: {len(scores)}")
-        print(f"  Average similarity: {np.mean(scores):.4f}")
-        print(f"  Best match score: {max(scores):.4f}")
+        print(f"  Average similarity: {scores.mean():.4f}")
+        print(f"  Best match score: {scores.max():.4f}")
         print(f"  Median similarity: {np.median(scores):.4f}")
 
-    def run_complete_pipeline(self, resume_path=None, top_n=10):
+    def run_complete_pipeline(self, resume_path=None, top_n=10, keep_model=False):
         """
         Run the complete pipeline from Stage 1 to Stage 4
+        keep_model leaves the embedding model loaded afterwards, for callers that
+        run the pipeline more than once (otherwise it's freed before Stage 4)
         """
         print("="*80)
         print("COMPLETE JOB MATCHING PIPELINE")
@@ -369,11 +479,21 @@ class CompleteJobMatchingPipeline:
                 print("Pipeline failed at Stage 3")
                 return False
             
+            # Nothing gets embedded after Stage 3, so free the model before
+            # Stage 4 instead of holding both in memory
+            if not keep_model:
+                self.embedding_generator.release_model()
+            
             # Stage 4: Similarity Matching
             if not self.run_stage4_similarity_matching(top_n):
                 print("Pipeline failed at Stage 4")
                 return False
             
+            # Results only need the scores and top indexes from here on
+            self.job_embeddings = np.empty((0, 0), dtype=np.int8)
+            self.job_norms = None
+            gc.collect()
+            
             # Display results
             self.display_results()
             
@@ -404,61 +524,112 @@ class CompleteJobMatchingPipeline:
         unique_jobs = []
         
         for job in jobs:
-            identifier = (
-                job.get('title', '').lower().strip(),
-                job.get('company', '').lower().strip()
-            )
+            title = str(job.get('title') or '').lower().strip()
+            company = str(job.get('company') or '').lower().strip()
+            if not title and not company:
+                continue
             
-            if identifier not in seen and identifier != ('', ''):
+            # one joined string key hashes faster than a (title, company) tuple
+            identifier = title + '\x1f' + company
+            if identifier not in seen:
                 seen.add(identifier)
                 unique_jobs.append(job)
         
         print(f"Removed {len(jobs) - len(unique_jobs)} duplicates")
         return unique_jobs
 
-    def _clean_job_data(self, job):
-        """Clean job posting data"""
-        return {
-            'title': self._clean_text(job.get('title', 'Unknown Title')),
-            'company': self._clean_text(job.get('company', 'Unknown Company')),
-            'location': self._clean_text(job.get('location', 'Unknown Location')),
-            'description': self._clean_text(job.get('description', 'No description')),
-            'url': job.get('url', ''),
-            'source': job.get('source', 'Unknown'),
-            'scraped_date': job.get('scraped_date', datetime.now().strftime('%Y-%m-%d'))
+    def _wait_for_warmup(self):
+        """Wait for the background model warm-up started in __init__ (if it's still running)"""
+        if self._warmup_thread is not None:
+            self._warmup_thread.join()
+            self._warmup_thread = None
+
+    def _embedding_cache_file(self):
+        """Cache file for the job embeddings, keyed by model, backend and job text"""
+        # only the fields that go into the embedding text are hashed. The backend
+        # (torch, torch-fp16, onnx, onnx-int8) changes the vectors a little too
+        df = self.processed_df[['title', 'company', 'location', 'description']]
+        generator = self.embedding_generator
+        job_hash = hashlib.sha1(f"{generator.model_name}|{generator.backend}".encode('utf-8'))
+        job_hash.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        return os.path.join(EMBEDDING_CACHE_DIR, f"job_embeddings_{job_hash.hexdigest()[:16]}.npy")
+
+    def _save_embedding_cache(self, cache_file):
+        """Write the job embeddings to the cache, keeping only the newest few cache files"""
+        # written under a temporary name and then renamed, so a crash halfway
+        # never leaves a broken file that the next run would load
+        temp_file = f"{cache_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(EMBEDDING_CACHE_DIR, exist_ok=True)
+            with open(temp_file, 'wb') as f:
+                np.save(f, self.job_embeddings)
+            os.replace(temp_file, cache_file)
+            
+            cache_files = [entry for entry in os.scandir(EMBEDDING_CACHE_DIR)
+                           if entry.name.startswith('job_embeddings_') and entry.name.endswith('.npy')]
+            cache_files.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+            for entry in cache_files[EMBEDDING_CACHE_MAX_FILES:]:
+                os.remove(entry.path)
+        except Exception as e:
+            print(f"Warning: Could not cache job embeddings: {e}")
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+
+    def _clean_job_data(self, jobs):
+        """Clean all job postings at once, one column at a time"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        columns = {
+            'title': [job.get('title', 'Unknown Title') for job in jobs],
+            'company': [job.get('company', 'Unknown Company') for job in jobs],
+            'location': [job.get('location', 'Unknown Location') for job in jobs],
+            'description': [job.get('description', 'No description') for job in jobs]
         }
+        
+        # spreading the regex work over several processes only pays off
+        # once there are thousands of jobs to clean
+        if len(jobs) >= PARALLEL_CLEAN_MIN_JOBS and CPU_COUNT > 1:
+            # forking while the warm-up thread is inside torch can leave the
+            # worker processes stuck on a lock that thread was holding
+            self._wait_for_warmup()
+            cleaned = _clean_text_columns_parallel(columns)
+        else:
+            cleaned = {field: clean_text_column(values) for field, values in columns.items()}
+        
+        df = pd.DataFrame({
+            **cleaned,
+            'url': [job.get('url', '') for job in jobs],
+            'source': [job.get('source', 'Unknown') for job in jobs],
+            'scraped_date': [job.get('scraped_date', today) for job in jobs]
+        })
+        return df
 
     def _clean_text(self, text):
         """Clean text data"""
         if not text:
             return ""
         
-        # Remove HTML tags
-        import re
-        text = re.sub(r'<[^>]+>', ' ', str(text))
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
+        # Remove HTML tags, then extra whitespace
+        return _WHITESPACE_RE.sub(' ', _HTML_TAG_RE.sub(' ', str(text))).strip()
 
-    def _is_valid_job(self, job):
-        """Check if job has minimum required data"""
+    def _is_valid_job(self, df):
+        """Check which jobs have minimum required data"""
         return (
-            len(job['title'].strip()) > 0 and
-            len(job['company'].strip()) > 0 and
-            len(job['description'].strip()) >= 50  # Minimum description length
+            (df['title'].str.len() > 0) &
+            (df['company'].str.len() > 0) &
+            (df['description'].str.len() >= 50)  # Minimum description length
         )
 
     def _load_resume(self, file_path):
         """Load resume from file"""
         try:
-            if file_path.endswith('.txt'):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return f.read()
-            else:
-                print(f"Note: Only .txt files supported. Using default resume.")
-                return self._get_default_resume()
+            # cached, so repeated runs on an unchanged file don't re-read/re-parse it
+            return _read_resume_file(file_path, os.path.getmtime(file_path), os.path.getsize(file_path))
+        except ImportError as e:
+            print(f"Note: {e}. Using default resume.")
+            return self._get_default_resume()
+        except ValueError:
+            print(f"Note: Only .txt, .pdf and .docx files supported. Using default resume.")
+            return self._get_default_resume()
         except Exception as e:
             print(f"Error loading resume: {e}")
             return self._get_default_resume()
@@ -490,28 +661,46 @@ class CompleteJobMatchingPipeline:
         """
 
 
-def main():
+def main(argv=None):
     """
     Main function to run the complete pipeline
+    Anything not given on the command line is asked for, unless --yes is set
+    (then the defaults are used and nothing waits on input)
     """
+    parser = argparse.ArgumentParser(description="Run the complete job matching pipeline")
+    parser.add_argument('-y', '--yes', action='store_true', help="don't ask anything, use defaults for missing options")
+    parser.add_argument('--location', help=f"job search location (default: {LOCATION})")
+    parser.add_argument('--keywords', help=f"search keywords (default: {KEYWORDS})")
+    parser.add_argument('--resume', help="resume file path (.txt, .pdf or .docx)")
+    parser.add_argument('--top-n', type=int, help="number of top matches to show (default: 10)")
+    args = parser.parse_args(argv)
+    
     print("Complete Job Matching System")
     print("Integrating all stages with local LLM embeddings")
     
     # Get user inputs
-    location = input(f"Enter job search location (default: {LOCATION}): ").strip()
+    location = args.location
+    if location is None and not args.yes:
+        location = input(f"Enter job search location (default: {LOCATION}): ").strip()
     if not location:
         location = LOCATION
     
-    keywords = input(f"Enter search keywords (default: {KEYWORDS}): ").strip()
+    keywords = args.keywords
+    if keywords is None and not args.yes:
+        keywords = input(f"Enter search keywords (default: {KEYWORDS}): ").strip()
     if not keywords:
         keywords = KEYWORDS
     
-    resume_path = input("Enter resume file path (.txt) (optional): ").strip()
+    resume_path = args.resume
+    if resume_path is None and not args.yes:
+        resume_path = input("Enter resume file path (.txt, .pdf or .docx) (optional): ").strip()
     if resume_path and not os.path.exists(resume_path):
         print(f"Warning: Resume file not found. Using default resume.")
         resume_path = None
     
-    top_n = input("Number of top matches to show (default: 10): ").strip()
+    top_n = args.top_n
+    if top_n is None and not args.yes:
+        top_n = input("Number of top matches to show (default: 10): ").strip()
     try:
         top_n = int(top_n) if top_n else 10
     except ValueError:
@@ -524,10 +713,11 @@ def main():
     print(f"  Resume: {resume_path or 'Default resume'}")
     print(f"  Top matches: {top_n}")
     
-    proceed = input("\nProceed with pipeline? (y/n): ").strip().lower()
-    if proceed not in ['y', 'yes']:
-        print("Exited Pipeline")
-        return
+    if not args.yes:
+        proceed = input("\nProceed with pipeline? (y/n): ").strip().lower()
+        if proceed not in ['y', 'yes']:
+            print("Exited Pipeline")
+            return
     
     # Initialize and run pipeline
     pipeline = CompleteJobMatchingPipeline(
@@ -3,6 +3,8 @@
 config file so you dont need to change every single file
 """
 
+from functools import lru_cache
+
 # Basic search settings
 LOCATION = "St. Louis, MO"
 KEYWORDS = "computer science software developer python"
@@ -23,14 +25,14 @@ WAIT_TIME_MIN = 2  # minimum seconds
 WAIT_TIME_MAX = 4  # maximum seconds
 
 # Required fields that every job posting should habe or it wont work
-REQUIRED_FIELDS = [
+REQUIRED_FIELDS = (
     'title',
     'company', 
     'location',
     'description',
     'url',
     'source'
-]
+)
 
 # File names for saved data
 OUTPUT_FILES = {
@@ -40,6 +42,13 @@ OUTPUT_FILES = {
     'final_json': 'final_jobs.json'
 }
 
+# Folder where job embeddings get cached so reruns on the same jobs skip the model
+EMBEDDING_CACHE_DIR = 'embedding_cache'
+EMBEDDING_CACHE_MAX_FILES = 5  # only the most recently used ones are kept
+
+# Folder for INT8-quantized copies of the embedding model (made once, reused after)
+QUANTIZED_MODEL_DIR = 'quantized_models'
+
 # API settings (add a key here if you want, program runs without one)
 API_KEYS = {
     'rapidapi_key': None, 
@@ -48,7 +57,8 @@ API_KEYS = {
 }
 
 # Keywords to look for in job titles/descriptions
-GOOD_KEYWORDS = [
+# (tuples so nothing can change them by accident)
+GOOD_KEYWORDS = (
     'software',
     'developer', 
     'programmer',
@@ -61,14 +71,14 @@ GOOD_KEYWORDS = [
     'full stack',
     'backend',
     'frontend'
-]
+)
 
 # Keywords to avoid (can add to this list, but these 3 are pretty big dealbreakers usually)
-AVOID_KEYWORDS = [
+AVOID_KEYWORDS = (
     'unpaid',
     'volunteer',
     'sales' 
-]
+)
 
 # Quality thresholds (make sure you don't get weird fake job postings with no info)
 QUALITY_SETTINGS = {
@@ -82,8 +92,9 @@ REQUEST_HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 }
 
-# Print settings when this file is run
-if __name__ == "__main__":
+@lru_cache(maxsize=1)
+def describe():
+    """Print the settings (only the first time, later calls do nothing)"""
     print("=== Job Matching System Configuration ===")
     print(f"Location: {LOCATION}")
     print(f"Keywords: {KEYWORDS}")
@@ -95,4 +106,8 @@ if __name__ == "__main__":
     ##if any(API_KEYS.values()):
     ##    print("API keys configured")
     ##else:
-    ##    print("No API keys configured (using free APIs)")
\ No newline at end of file
+    ##    print("No API keys configured (using free APIs)")
+
+# Print settings when this file is run
+if __name__ == "__main__":
+    describe()
\ No newline at end of file
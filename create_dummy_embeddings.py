@@ -9,40 +9,58 @@ import pandas as pd
 import json
 import numpy as np
 import os
+import re
+import argparse
 from datetime import datetime
 
-def create_dummy_embeddings():
+from job_matcher import quantize_embeddings, cosine_similarities, find_latest_file
+from data_loader import read_jobs_csv
+
+# Job type keywords per block of embedding dimensions, compiled once
+JOB_PATTERNS = [
+    (re.compile('software|developer|engineer|programmer'), slice(0, 100)),
+    (re.compile('data|scientist|analyst|machine learning'), slice(100, 200)),
+    (re.compile('manager|lead|senior|director'), slice(200, 300))
+]
+
+# Embeddings are filled in blocks of this many jobs, so the random noise and
+# keyword boosts never need temporaries the size of the whole matrix
+BLOCK_ROWS = 8192
+
+def create_dummy_embeddings(job_data_file=None):
     """
     Create dummy embeddings for testing the job matcher
+    If no job data file is given, the newest Stage 1 output is used
     """
     print("=== Creating Dummy Embeddings for Testing ===")
     print("WARNING: These are fake embeddings")
     
-    # Look for job data file
-    job_data_files = []
-    import glob
-    for pattern in ['final_jobs_*.csv', 'job_postings.csv', 'scraped_jobs.csv']:
-        files = glob.glob(pattern)
-        job_data_files.extend(files)
+    # Look for job data file, newest run first
+    if not job_data_file:
+        job_data_file = find_latest_file([('final_jobs_', '.parquet'), ('final_jobs_', '.csv'), ('job_postings.csv', ''), ('scraped_jobs.csv', '')])
     
-    if not job_data_files:
+    if not job_data_file:
         print("❌ No job data files found!")
         print("   Run Stage 1 first to collect job data")
         return False
     
-    job_data_file = job_data_files[0]
     print(f"Using job data from: {job_data_file}")
     
     # Load job data
     try:
         if job_data_file.endswith('.csv'):
-            df = pd.read_csv(job_data_file)
-            job_data = df.to_dict('records')
+            # only the title is used, so don't parse the (long) descriptions at all
+            header = pd.read_csv(job_data_file, nrows=0).columns
+            usecols = ['title'] if 'title' in header else None
+            df = read_jobs_csv(job_data_file, usecols=usecols)
+        elif job_data_file.endswith('.parquet'):
+            # stage 1 parquet files always have a title column
+            df = pd.read_parquet(job_data_file, columns=['title'])
         else:
             with open(job_data_file, 'r') as f:
-                job_data = json.load(f)
+                df = pd.DataFrame(json.load(f))
         
-        print(f"Loaded {len(job_data)} jobs")
+        print(f"Loaded {len(df)} jobs")
         
     except Exception as e:
         print(f"❌ Error loading job data: {e}")
@@ -50,51 +68,44 @@ def create_dummy_embeddings():
     
     # Create dummy embeddings
     embedding_dim = 1536  # Common embedding dimension
-    num_jobs = len(job_data)
+    num_jobs = len(df)
     
     print(f"Creating {num_jobs} dummy job embeddings (dimension: {embedding_dim})")
     
-    # Create random embeddings for jobs
-    # Use different random seeds to get variety
-    np.random.seed(42)
-    job_embeddings = []
+    # Job type keyword masks over all titles (just N booleans per pattern)
+    if 'title' in df.columns:
+        titles = df['title'].fillna('').astype(str).str.lower()
+    else:
+        titles = pd.Series([''] * num_jobs, dtype=object)
+    masks = [titles.str.contains(pattern).to_numpy() for pattern, _ in JOB_PATTERNS]
+    del df, titles
     
-    for i, job in enumerate(job_data):
-        # Create somewhat realistic embedding based on job content
-        # This is still random but tries to make similar jobs have similar embeddings
-        
-        # Use job title and company to create a "base" embedding
-        title = str(job.get('title', '')).lower()
-        company = str(job.get('company', '')).lower()
-        
-        # Create base vector
-        base_vector = np.random.normal(0, 0.1, embedding_dim)
+    # Create random embeddings for jobs, one block at a time straight into the final matrix
+    # This is still random but tries to make similar jobs have similar embeddings
+    rng = np.random.default_rng(42)
+    job_embeddings = np.empty((num_jobs, embedding_dim), dtype=np.float32)
+    
+    for start in range(0, num_jobs, BLOCK_ROWS):
+        block = job_embeddings[start:start + BLOCK_ROWS]
+        rng.standard_normal(out=block, dtype=np.float32)
+        block *= 0.1
         
         # Add some patterns based on job type
-        if any(word in title for word in ['software', 'developer', 'engineer', 'programmer']):
-            base_vector[:100] += np.random.normal(0.2, 0.1, 100)
-        
-        if any(word in title for word in ['data', 'scientist', 'analyst', 'machine learning']):
-            base_vector[100:200] += np.random.normal(0.2, 0.1, 100)
-        
-        if any(word in title for word in ['manager', 'lead', 'senior', 'director']):
-            base_vector[200:300] += np.random.normal(0.2, 0.1, 100)
+        for mask, (_, columns) in zip(masks, JOB_PATTERNS):
+            block_mask = mask[start:start + BLOCK_ROWS]
+            block[block_mask, columns] += rng.normal(0.2, 0.1, (block_mask.sum(), 100)).astype(np.float32)
         
-        # Normalize the vector (common practice for embeddings)
-        norm = np.linalg.norm(base_vector)
-        if norm > 0:
-            base_vector = base_vector / norm
-        
-        job_embeddings.append(base_vector.tolist())
+        # Normalize the vectors (common practice for embeddings)
+        block /= np.linalg.norm(block, axis=1, keepdims=True).clip(min=1e-12)
     
     # Create dummy resume embedding
     print("Creating dummy resume embedding")
-    np.random.seed(123)  # Different seed for resume
+    rng = np.random.default_rng(123)  # Different seed for resume
     
     # Make resume embedding somewhat similar to software jobs
-    resume_embedding = np.random.normal(0, 0.1, embedding_dim)
-    resume_embedding[:100] += np.random.normal(0.3, 0.1, 100)  # Strong software signal
-    resume_embedding[300:400] += np.random.normal(0.1, 0.05, 100)  # Some other skills
+    resume_embedding = rng.normal(0, 0.1, embedding_dim)
+    resume_embedding[:100] += rng.normal(0.3, 0.1, 100)  # Strong software signal
+    resume_embedding[300:400] += rng.normal(0.1, 0.05, 100)  # Some other skills
     
     # Normalize
     norm = np.linalg.norm(resume_embedding)
@@ -103,24 +114,33 @@ def create_dummy_embeddings():
     
     # Save embeddings
     try:
-        # Save job embeddings
-        with open('job_embeddings.json', 'w') as f:
-            json.dump(job_embeddings, f)
-        print("✅ Saved job_embeddings.json")
-        
-        # Also save as numpy array
-        np.save('job_embeddings.npy', np.array(job_embeddings))
+        # Save job embeddings (float32 .npy - much smaller and faster to load than JSON)
+        np.save('job_embeddings.npy', job_embeddings)
         print("✅ Saved job_embeddings.npy")
         
         # Save resume embedding
-        with open('resume_embedding.json', 'w') as f:
-            json.dump(resume_embedding.tolist(), f)
-        print("✅ Saved resume_embedding.json")
-        
-        # Also save as numpy array
-        np.save('resume_embedding.npy', resume_embedding)
+        np.save('resume_embedding.npy', resume_embedding.astype(np.float32))
         print("✅ Saved resume_embedding.npy")
         
+        # int8 copies are a quarter of the size - only keep them if the
+        # cosine scores stay close to the float32 ones
+        job_embeddings_i8 = quantize_embeddings(job_embeddings)
+        resume_embedding_i8 = quantize_embeddings(resume_embedding[None, :])[0]
+        exact = cosine_similarities(job_embeddings, resume_embedding)
+        approx = cosine_similarities(job_embeddings_i8, resume_embedding_i8)
+        max_error = float(np.abs(exact - approx).max()) if num_jobs else 0.0
+        
+        if max_error <= 1e-2:
+            np.save('job_embeddings_i8.npy', job_embeddings_i8)
+            np.save('resume_embedding_i8.npy', resume_embedding_i8)
+            print(f"✅ Saved job_embeddings_i8.npy and resume_embedding_i8.npy (max cosine error {max_error:.5f})")
+        else:
+            # the matcher picks _i8 files over .npy, so older ones can't be left behind
+            for stale_file in ['job_embeddings_i8.npy', 'resume_embedding_i8.npy']:
+                if os.path.exists(stale_file):
+                    os.remove(stale_file)
+            print(f"Skipped int8 embeddings (max cosine error {max_error:.5f} is too high)")
+        
         print(f"\nDummy embeddings created successfully!")
         print(f"You can now test job_matcher.py")
         print(f"\nREMEMBER: These are fake embeddings!")
@@ -132,19 +152,25 @@ def create_dummy_embeddings():
         print(f"❌ Error saving embeddings: {e}")
         return False
 
-def main():
+def main(argv=None):
     """
     Main function
     """
+    parser = argparse.ArgumentParser(description="Create dummy embeddings for testing Stage 4")
+    parser.add_argument('-y', '--yes', action='store_true', help="don't ask for confirmation")
+    parser.add_argument('--data-file', help="job data file to use instead of the newest final_jobs_* file")
+    args = parser.parse_args(argv)
+    
     print("This script creates dummy embeddings for testing Stage 4")
     print("Use this only if you want to test the job matcher before implementing real embeddings")
     
-    response = input("\nCreate dummy embeddings for testing? (y/n): ").strip().lower()
-    if response not in ['y', 'yes']:
-        print("Cancelled.")
-        return
+    if not args.yes:
+        response = input("\nCreate dummy embeddings for testing? (y/n): ").strip().lower()
+        if response not in ['y', 'yes']:
+            print("Cancelled.")
+            return
     
-    success = create_dummy_embeddings()
+    success = create_dummy_embeddings(args.data_file)
     
     if success:
         print(f"\n{'='*50}")
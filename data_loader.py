@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Job Data Loader
+reads the job CSVs from Stage 1 and 2 for the later stages
+"""
+
+import csv
+import pandas as pd
+
+# pyarrow reads big CSVs with several threads, pandas' own parser is fine without it
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa_csv = None
+
+
+def read_jobs_csv(filename, usecols=None):
+    """
+    Read a job CSV into a DataFrame, through pyarrow when it's installed
+    (pandas' engine='pyarrow' can't be told that quoted descriptions have
+    newlines in them, so big files fall out of sync and fail to parse)
+    """
+    if pa_csv is None:
+        return pd.read_csv(filename, usecols=usecols)
+    
+    # every job field is text - left alone pyarrow would turn columns like
+    # scraped_date into datetimes, which pandas' parser never did
+    with open(filename, newline='', encoding='utf-8-sig') as f:
+        header = next(csv.reader(f), [])
+    
+    # empty cells come back missing, same as pandas' parser
+    convert_options = pa_csv.ConvertOptions(column_types=dict.fromkeys(header, pa.string()),
+                                            strings_can_be_null=True)
+    if usecols is not None:
+        convert_options.include_columns = usecols
+    table = pa_csv.read_csv(filename,
+                            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+                            convert_options=convert_options)
+    return table.to_pandas()
@@ -6,8 +6,82 @@ cleans up the stuff from stage 1
 
 import pandas as pd
 import re
+import html
 import json
+import os
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from data_loader import read_jobs_csv
+
+# Arrow strings and Parquet output need pyarrow, plain object columns and CSV are used otherwise
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+# Job text columns get stored as Arrow strings when pyarrow is around (one buffer per
+# column instead of a Python object per cell, and the .str methods run in Arrow).
+# Missing values stay NaN like pandas 3's default string dtype, which older pandas
+# (before 2.3) can't do, so those keep plain object columns
+TEXT_COLUMNS = ['title', 'company', 'location', 'description', 'source', 'url']
+TEXT_DTYPE = None
+if pyarrow is not None:
+    try:
+        TEXT_DTYPE = pd.StringDtype('pyarrow', na_value=float('nan'))
+    except TypeError:
+        pass
+
+# What each text column ends up as when the value is missing
+MISSING_TEXT = {'title': 'Unknown Position', 'location': 'Unknown', 'company': '', 'description': ''}
+
+# Common boilerplate text to cut out of descriptions
+BOILERPLATE_PHRASES = [
+    'equal opportunity employer',
+    'apply now',
+    'click here to apply',
+    'send resume to'
+]
+
+# Cleaning patterns, compiled once instead of on every call
+_HTML_RE = re.compile(r'<.*?>')
+_WS_RE = re.compile(r'\s+')
+_BOILERPLATE_RE = re.compile('|'.join(map(re.escape, BOILERPLATE_PHRASES)), re.IGNORECASE)
+# Title prefixes, checked in this order (so "Job: Hiring: ..." loses both)
+_TITLE_PREFIX_RE = re.compile(r'^(?:Job:\s*)?(?:Position:\s*)?(?:Hiring:\s*)?')
+# ASCII control bytes to drop from resumes (printable ASCII and \n are kept)
+_NONPRINT_BYTES = bytes(i for i in range(128) if not (0x20 <= i <= 0x7E or i == 0x0A))
+
+# Descriptions are only cleaned in parallel processes above this many jobs
+PARALLEL_CLEAN_MIN_JOBS = 5000
+CPU_COUNT = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+
+
+def clean_description_values(descriptions):
+    """SimpleJobCleaner.clean_description for a whole column"""
+    text = descriptions.astype(str).where(descriptions.notna(), '')
+    text = text.where(~text.isin(['No Description', 'N/A', 'NA']), '')
+    
+    # Remove HTML (only rows with an & can have entities to decode)
+    text = text.str.replace(_HTML_RE, '', regex=True)
+    has_entity = text.str.contains('&', regex=False)
+    text = text.where(~has_entity, text[has_entity].map(html.unescape))
+    
+    # Clean whitespace, remove boilerplate, then tidy up what's left
+    text = text.str.replace(_WS_RE, ' ', regex=True).str.strip()
+    text = text.str.replace(_BOILERPLATE_RE, '', regex=True)
+    return text.str.replace(_WS_RE, ' ', regex=True).str.strip()
+
+
+def _clean_descriptions_parallel(descriptions):
+    """
+    clean_description_values split into one chunk per CPU core
+    """
+    size = -(-len(descriptions) // CPU_COUNT)  # ceiling division
+    chunks = [descriptions.iloc[start:start + size] for start in range(0, len(descriptions), size)]
+    
+    with ProcessPoolExecutor(max_workers=CPU_COUNT) as executor:
+        return pd.concat(executor.map(clean_description_values, chunks))
+
 
 class SimpleJobCleaner:
     def __init__(self):
@@ -16,18 +90,25 @@ class SimpleJobCleaner:
         self.final_count = 0
     
     def load_jobs(self, filename):
-        """Load job data from CSV or JSON file"""
+        """Load job data from CSV, Parquet or JSON file"""
         try:
             if filename.endswith('.csv'):
-                self.jobs_data = pd.read_csv(filename)
+                self.jobs_data = read_jobs_csv(filename)
+            elif filename.endswith('.parquet'):
+                self.jobs_data = pd.read_parquet(filename)
             elif filename.endswith('.json'):
                 with open(filename, 'r') as f:
                     jobs_list = json.load(f)
                 self.jobs_data = pd.DataFrame(jobs_list)
             else:
-                print("Error: File must be .csv or .json")
+                print("Error: File must be .csv, .parquet or .json")
                 return False
             
+            if TEXT_DTYPE is not None:
+                # pandas 3 already reads text this way, older versions hand back object columns
+                to_convert = [c for c in TEXT_COLUMNS if c in self.jobs_data.columns and self.jobs_data[c].dtype == object]
+                self.jobs_data = self.jobs_data.astype(dict.fromkeys(to_convert, TEXT_DTYPE))
+            
             self.original_count = len(self.jobs_data)
             print(f"Loaded {self.original_count} jobs from {filename}")
             return True
@@ -41,16 +122,9 @@ class SimpleJobCleaner:
         if pd.isna(text):
             return ""
         
-        # Remove HTML tags
-        clean_text = re.sub(r'<.*?>', '', str(text))
-        
-        # Fix common HTML entities
-        clean_text = clean_text.replace('&amp;', '&')
-        clean_text = clean_text.replace('&lt;', '<')
-        clean_text = clean_text.replace('&gt;', '>')
-        clean_text = clean_text.replace('&quot;', '"')
-        
-        return clean_text
+        # Remove HTML tags, then turn every HTML entity (&amp;, &#39;, &nbsp;, ...)
+        # back into its character in one go
+        return html.unescape(_HTML_RE.sub('', str(text)))
     
     def clean_whitespace(self, text):
         """Clean up extra spaces and weird characters"""
@@ -60,7 +134,7 @@ class SimpleJobCleaner:
         text = str(text)
         
         # Replace multiple spaces with single space
-        text = re.sub(r'\s+', ' ', text)
+        text = _WS_RE.sub(' ', text)
         
         # Remove leading/trailing spaces
         text = text.strip()
@@ -89,17 +163,8 @@ class SimpleJobCleaner:
         if pd.isna(title):
             return "Unknown Position"
         
-        title = str(title).strip()
-        
         # Remove common prefixes
-        if title.startswith('Job:'):
-            title = title[4:].strip()
-        if title.startswith('Position:'):
-            title = title[9:].strip()
-        if title.startswith('Hiring:'):
-            title = title[7:].strip()
-        
-        return title
+        return _TITLE_PREFIX_RE.sub('', str(title).strip()).strip()
     
     def clean_description(self, description):
         """Clean job descriptions"""
@@ -118,38 +183,69 @@ class SimpleJobCleaner:
         # Clean whitespace
         description = self.clean_whitespace(description)
         
-        # Remove common boilerplate text
-        boilerplate = [
-            'equal opportunity employer',
-            'apply now',
-            'click here to apply',
-            'send resume to'
-        ]
-        
-        for phrase in boilerplate:
-            description = re.sub(phrase, '', description, flags=re.IGNORECASE)
+        # Remove common boilerplate text (all phrases in one pass)
+        description = _BOILERPLATE_RE.sub('', description)
         
         description = self.clean_whitespace(description)
         
         return description
     
+    # Whole-column versions of the cleaners above - same results, but the work
+    # happens in pandas string methods instead of a Python call per row
+    
+    def clean_whitespace_column(self, values):
+        """clean_whitespace for a whole column"""
+        text = values.astype(str).where(values.notna(), '')
+        return text.str.replace(_WS_RE, ' ', regex=True).str.strip()
+    
+    def fix_locations_column(self, locations):
+        """fix_locations for a whole column"""
+        # Jobs repeat the same few cities, so fix each distinct location once
+        codes, uniques = pd.factorize(locations)
+        fixed = pd.Series(uniques).astype(str).str.strip()
+        fixed = fixed.str.replace('St. Louis', 'Saint Louis', regex=False)
+        fixed = fixed.str.replace('St Louis', 'Saint Louis', regex=False)
+        fixed = fixed.str.replace('KC', 'Kansas City', regex=False)
+        
+        # missing locations get code -1, which picks up the 'Unknown' tacked on the end
+        fixed = pd.concat([fixed, pd.Series(['Unknown'])], ignore_index=True)
+        return fixed.take(codes).set_axis(locations.index).rename(locations.name)
+    
+    def clean_job_title_column(self, titles):
+        """clean_job_title for a whole column"""
+        cleaned = titles.astype(str).str.strip()
+        cleaned = cleaned.str.replace(_TITLE_PREFIX_RE, '', regex=True).str.strip()
+        return cleaned.where(titles.notna(), 'Unknown Position')
+    
+    def clean_description_column(self, descriptions):
+        """clean_description for a whole column"""
+        # the regex work only pays for extra processes once there are thousands of rows
+        if len(descriptions) >= PARALLEL_CLEAN_MIN_JOBS and CPU_COUNT > 1:
+            return _clean_descriptions_parallel(descriptions)
+        return clean_description_values(descriptions)
+    
+    def duplicate_rows(self):
+        """True for every job whose title + company (ignoring case) showed up earlier"""
+        keys = self.jobs_data['title'].str.lower() + '|' + self.jobs_data['company'].str.lower()
+        return keys.duplicated()
+    
+    def rows_to_keep(self):
+        """
+        Rows that will get past remove_duplicates() and the title/company check in
+        remove_bad_jobs() - both only look at the (already cleaned) title and company
+        """
+        title = self.jobs_data['title']
+        company = self.jobs_data['company']
+        return ~self.duplicate_rows() & title.notna() & (title != '') & company.notna() & (company != '')
+    
     def remove_duplicates(self):
         """Remove duplicate job postings"""
         print("Removing duplicates...")
         
         before_count = len(self.jobs_data)
         
-        # Create a key to check for duplicates
-        self.jobs_data['temp_key'] = (
-            self.jobs_data['title'].str.lower() + '|' + 
-            self.jobs_data['company'].str.lower()
-        )
-        
-        # Remove duplicates
-        self.jobs_data = self.jobs_data.drop_duplicates(subset=['temp_key'])
-        
-        # Remove the temporary column
-        self.jobs_data = self.jobs_data.drop('temp_key', axis=1)
+        # Remove duplicates (the key is never stored as a column)
+        self.jobs_data = self.jobs_data[~self.duplicate_rows()]
         
         after_count = len(self.jobs_data)
         removed = before_count - after_count
@@ -162,19 +258,18 @@ class SimpleJobCleaner:
         
         before_count = len(self.jobs_data)
         
-        # Remove jobs without title or company
-        self.jobs_data = self.jobs_data[
-            (self.jobs_data['title'].notna()) & 
-            (self.jobs_data['title'] != '') &
-            (self.jobs_data['company'].notna()) & 
-            (self.jobs_data['company'] != '')
-        ]
+        title = self.jobs_data['title']
+        company = self.jobs_data['company']
+        desc_len = self.jobs_data['description'].str.len()
         
-        # Remove jobs with very short descriptions
-        self.jobs_data = self.jobs_data[
-            (self.jobs_data['description'].str.len() >= 20) | 
-            (self.jobs_data['description'].isna())
-        ]
+        # Remove jobs without title or company, and jobs with very short descriptions
+        # (one combined mask so the frame only gets copied once)
+        keep = (
+            title.notna() & title.ne('') &
+            company.notna() & company.ne('') &
+            (desc_len.ge(20) | desc_len.isna())
+        )
+        self.jobs_data = self.jobs_data[keep]
         
         after_count = len(self.jobs_data)
         removed = before_count - after_count
@@ -185,29 +280,23 @@ class SimpleJobCleaner:
         """Create a clean text field for embeddings"""
         print("Creating text for embeddings...")
         
-        clean_texts = []
+        # Build each "Label: value" part for the whole column at once, with
+        # a " | " in front so empty parts just drop out, then cut off the first " | "
+        combined = pd.Series('', index=self.jobs_data.index, dtype=object)
         
-        for _, job in self.jobs_data.iterrows():
-            # Combine the important parts
-            parts = []
-            
-            if pd.notna(job['title']):
-                parts.append(f"Title: {job['title']}")
-            
-            if pd.notna(job['company']):
-                parts.append(f"Company: {job['company']}")
+        for label, column in [('Title', 'title'), ('Company', 'company'),
+                              ('Location', 'location'), ('Description', 'description')]:
+            values = self.jobs_data[column]
+            keep = values.notna()
+            if column == 'description':
+                keep &= values.astype(str) != ''
             
-            if pd.notna(job['location']):
-                parts.append(f"Location: {job['location']}")
-            
-            if pd.notna(job['description']) and job['description']:
-                parts.append(f"Description: {job['description']}")
-            
-            # Join everything together
-            clean_text = " | ".join(parts)
-            clean_texts.append(clean_text)
+            # object on both sides, Arrow strings can't be added onto an object Series
+            part = (f" | {label}: " + values.astype(str)).where(keep, '')
+            combined += part.astype(object)
         
-        self.jobs_data['clean_text'] = clean_texts
+        # infer_objects gives the same type assigning a list of strings would (str on pandas 3)
+        self.jobs_data['clean_text'] = combined.str.slice(3).infer_objects()
     
     def clean_all_jobs(self):
         """Clean all the job data"""
@@ -218,18 +307,24 @@ class SimpleJobCleaner:
         print("\n=== Starting Job Cleaning ===")
         print(f"Starting with {len(self.jobs_data)} jobs")
         
+        # Fill in missing values up front so every step below works on plain strings
+        self.jobs_data = self.jobs_data.fillna(MISSING_TEXT)
+        
         # Clean each field
         print("\n1. Cleaning titles...")
-        self.jobs_data['title'] = self.jobs_data['title'].apply(self.clean_job_title)
+        self.jobs_data['title'] = self.clean_job_title_column(self.jobs_data['title'])
         
         print("2. Fixing locations...")
-        self.jobs_data['location'] = self.jobs_data['location'].apply(self.fix_locations)
+        self.jobs_data['location'] = self.fix_locations_column(self.jobs_data['location'])
         
         print("3. Cleaning company names...")
-        self.jobs_data['company'] = self.jobs_data['company'].apply(self.clean_whitespace)
+        self.jobs_data['company'] = self.clean_whitespace_column(self.jobs_data['company'])
         
+        # Descriptions are the slow part - skip the rows step 5 is going to drop anyway
         print("4. Cleaning descriptions...")
-        self.jobs_data['description'] = self.jobs_data['description'].apply(self.clean_description)
+        keep = self.rows_to_keep()
+        cleaned = self.clean_description_column(self.jobs_data.loc[keep, 'description'])
+        self.jobs_data['description'] = cleaned.reindex(self.jobs_data.index)
         
         # Remove bad data
         print("\n5. Removing duplicates and bad jobs...")
@@ -257,10 +352,15 @@ class SimpleJobCleaner:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         if filename is None:
-            filename = f"clean_jobs_{timestamp}.csv"
+            # Parquet is smaller and much quicker for stage 3 to load back, CSV if we can't write it
+            extension = 'parquet' if pyarrow is not None else 'csv'
+            filename = f"clean_jobs_{timestamp}.{extension}"
         
         try:
-            self.jobs_data.to_csv(filename, index=False)
+            if filename.endswith('.parquet'):
+                self.jobs_data.to_parquet(filename, index=False, compression='zstd')
+            else:
+                self.jobs_data.to_csv(filename, index=False)
             print(f"Saved cleaned data to {filename}")
             return filename
         except Exception as e:
@@ -275,14 +375,14 @@ class SimpleJobCleaner:
         
         print(f"\n=== Sample Cleaned Jobs ===")
         
-        for i in range(min(num, len(self.jobs_data))):
-            job = self.jobs_data.iloc[i]
+        samples = self.jobs_data[['title', 'company', 'location', 'description', 'clean_text']].head(num)
+        for i, (title, company, location, description, clean_text) in enumerate(samples.itertuples(index=False, name=None)):
             print(f"\nJob {i+1}:")
-            print(f"Title: {job['title']}")
-            print(f"Company: {job['company']}")
-            print(f"Location: {job['location']}")
-            print(f"Description: {job['description'][:100]}...")
-            print(f"Clean Text: {job['clean_text'][:100]}...")
+            print(f"Title: {title}")
+            print(f"Company: {company}")
+            print(f"Location: {location}")
+            print(f"Description: {description[:100]}...")
+            print(f"Clean Text: {clean_text[:100]}...")
             print("-" * 50)
 
 
@@ -323,11 +423,11 @@ class ResumeTextCleaner:
         text = self.resume_text
         
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WS_RE.sub(' ', text)
         text = text.strip()
         
-        # Remove weird characters
-        text = re.sub(r'[^\x20-\x7E\n]', '', text)
+        # Remove weird characters (non-ASCII gets dropped by the encode, control bytes by translate)
+        text = text.encode('ascii', 'ignore').translate(None, _NONPRINT_BYTES).decode('ascii')
         
         self.clean_text = text
         print(f"Resume cleaned: {len(self.clean_text)} characters")
@@ -10,6 +10,7 @@ and ready for the next stage
 import pandas as pd
 import json
 from datetime import datetime
+from data_loader import read_jobs_csv
 
 class SimpleDataChecker:
     def __init__(self):
@@ -22,7 +23,10 @@ class SimpleDataChecker:
         """
         try:
             if filename.endswith('.csv'):
-                self.data = pd.read_csv(filename)
+                self.data = read_jobs_csv(filename)
+                print(f"* Loaded {len(self.data)} jobs from {filename}")
+            elif filename.endswith('.parquet'):
+                self.data = pd.read_parquet(filename)
                 print(f"* Loaded {len(self.data)} jobs from {filename}")
             elif filename.endswith('.json'):
                 with open(filename, 'r') as f:
@@ -30,7 +34,7 @@ class SimpleDataChecker:
                 self.data = pd.DataFrame(jobs_list)
                 print(f"* Loaded {len(self.data)} jobs from {filename}")
             else:
-                print("X File must be .csv or .json")
+                print("X File must be .csv, .parquet or .json")
                 return False
             
             self.total_jobs = len(self.data)
@@ -70,11 +74,11 @@ class SimpleDataChecker:
         
         for field in fields_to_check:
             if field in self.data.columns:
-                # Count empty, null, or "No X" values
-                empty_count = 0
-                for value in self.data[field]:
-                    if pd.isna(value) or str(value).strip() == '' or str(value).startswith('No '):
-                        empty_count += 1
+                # Count empty, null, or "No X" values (whole column at once)
+                values = self.data[field]
+                text = values.astype(str)
+                empty = values.isna() | text.str.strip().eq('') | text.str.startswith('No ')
+                empty_count = int(empty.sum())
                 
                 completeness = ((self.total_jobs - empty_count) / self.total_jobs) * 100
                 print(f"{field}: {completeness:.1f}% complete ({self.total_jobs - empty_count}/{self.total_jobs})")
@@ -101,8 +105,8 @@ class SimpleDataChecker:
                 # Show some examples
                 duplicate_jobs = self.data[duplicates][['title', 'company']].head(5)
                 print("Sample duplicates:")
-                for _, job in duplicate_jobs.iterrows():
-                    print(f"  - {job['title']} at {job['company']}")
+                for title, company in duplicate_jobs.itertuples(index=False, name=None):
+                    print(f"  - {title} at {company}")
             else:
                 print("* No exact duplicates found")
         else:
@@ -116,9 +120,9 @@ class SimpleDataChecker:
         
         if 'source' in self.data.columns:
             source_counts = self.data['source'].value_counts()
+            percentages = source_counts / self.total_jobs * 100
             
-            for source, count in source_counts.items():
-                percentage = (count / self.total_jobs) * 100
+            for source, count, percentage in zip(source_counts.index, source_counts, percentages):
                 print(f"{source}: {count} jobs ({percentage:.1f}%)")
         else:
             print("X No source information available")
@@ -132,12 +136,12 @@ class SimpleDataChecker:
         if 'location' in self.data.columns:
             # Count unique locations
             location_counts = self.data['location'].value_counts().head(10)
+            location_counts = location_counts[location_counts.index.astype(str) != 'No Location']
+            percentages = location_counts / self.total_jobs * 100
             
             print("Top 10 locations:")
-            for location, count in location_counts.items():
-                if str(location) != 'No Location':
-                    percentage = (count / self.total_jobs) * 100
-                    print(f"  {location}: {count} jobs ({percentage:.1f}%)")
+            for location, count, percentage in zip(location_counts.index, location_counts, percentages):
+                print(f"  {location}: {count} jobs ({percentage:.1f}%)")
         else:
             print("X No location information available")
     
@@ -149,21 +153,16 @@ class SimpleDataChecker:
         
         if 'description' in self.data.columns:
             # Calculate description lengths
-            desc_lengths = []
-            very_short = 0
-            
-            for desc in self.data['description']:
-                if pd.notna(desc) and str(desc) != 'No Description':
-                    length = len(str(desc))
-                    desc_lengths.append(length)
-                    if length < 50:  # Very short descriptions
-                        very_short += 1
+            descriptions = self.data['description']
+            text = descriptions.astype(str)
+            desc_lengths = text[descriptions.notna() & text.ne('No Description')].str.len()
+            very_short = int((desc_lengths < 50).sum())  # Very short descriptions
             
-            if desc_lengths:
-                avg_length = sum(desc_lengths) / len(desc_lengths)
+            if len(desc_lengths):
+                avg_length = desc_lengths.mean()
                 print(f"Average description length: {avg_length:.0f} characters")
-                print(f"Shortest: {min(desc_lengths)} characters")
-                print(f"Longest: {max(desc_lengths)} characters")
+                print(f"Shortest: {desc_lengths.min()} characters")
+                print(f"Longest: {desc_lengths.max()} characters")
                 print(f"Very short descriptions (< 50 chars): {very_short}")
                 
                 if very_short > len(desc_lengths) * 0.3:  # More than 30% are very short
@@ -10,37 +10,195 @@ No API keys needed
 
 """
 
-from sentence_transformers import SentenceTransformer
 import pandas as pd
-import json
+import orjson
 import numpy as np
 import time
 from datetime import datetime
 import os
+import gc
+import argparse
+import threading
+import contextlib
+import importlib.util
 from typing import List, Dict, Any
+from config import QUANTIZED_MODEL_DIR
+from data_loader import read_jobs_csv
+
+# Warm-up texts from tiny to past the model's max length, so each padded size the
+# real batches hit has already been through the model once
+WARMUP_TEXTS = ["warm up", "word " * 32, "word " * 128, "word " * 512]
+
+# ONNX file sentence-transformers writes for dynamic INT8 quantization
+QUANTIZED_ONNX_FILE = 'onnx/model_qint8_avx512_vnni.onnx'
+
+# The quantized / FP16 models are only used if their embeddings point the same way
+# as the full-precision ones (cosine similarity on a few sample texts)
+QUANTIZED_MIN_COSINE = 0.99
+FP16_MIN_COSINE = 0.999
+PRECISION_CHECK_TEXTS = [
+    "Software Engineer | Company: Tech Inc. | Python, Java and cloud services",
+    "Registered nurse for hospital night shift, patient care",
+    "Data analyst working with SQL, pandas and dashboards",
+    "Teaching Assistant - Computer Science, grading and office hours",
+]
+
+# Every CPU this process is allowed to run on (containers often get fewer than the machine has)
+CPU_COUNT = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+
+def set_torch_threads():
+    """One torch intra-op thread per CPU, and no extra inter-op pool on top of it"""
+    try:
+        import torch
+        torch.set_num_threads(CPU_COUNT)
+        torch.set_num_interop_threads(1)
+    except (ImportError, RuntimeError):
+        pass  # RuntimeError if torch already started its thread pools
+
+def onnx_available():
+    """
+    True if sentence-transformers can run models through ONNX Runtime
+    (needs: pip install optimum onnxruntime)
+    """
+    return all(importlib.util.find_spec(name) is not None for name in ('onnxruntime', 'optimum'))
 
 class LLMEmbeddingGenerator:
-    def __init__(self, model_name="all-MiniLM-L6-v2"):
+    def __init__(self, model_name="all-MiniLM-L6-v2", use_onnx=True, quantize=False):
         """
         Initialize the LLM embedding generator
+        With use_onnx (and onnxruntime installed) the model runs through ONNX Runtime,
+        which is a good bit faster on CPU than plain PyTorch. quantize goes one step
+        further and runs an INT8 copy of the model, about twice as fast again
+        """
+        # Use a good local model - this will download ~25MB first time
+        self.model_name = model_name
+        self.use_onnx = use_onnx
+        self.quantize = quantize
+        self.load_model()
+        
+        self.embeddings = []
+        self.embedding_matrix = None
+        self.job_data = None
+        self.resume_embedding = None
+    
+    def load_model(self):
+        """
+        Load the embedding model (again, if release_model() dropped it)
         """
         print(" Loading local LLM embedding model...")
         print("This might take a minute the first time (downloading model)...")
         
-        # Use a good local model - this will download ~25MB first time
-        self.model_name = model_name
+        self.backend = 'torch'
         try:
-            self.model = SentenceTransformer(model_name)
-            print(f"Loaded model: {model_name}")
+            # torch's default thread count inside containers is often way off,
+            # which leaves the encoder's matrix multiplies running on one core
+            set_torch_threads()
+            
+            # imported here, sentence_transformers pulls in torch which takes a
+            # few seconds - no reason to pay that just for importing this module
+            from sentence_transformers import SentenceTransformer
+            
+            self.model = None
+            if self.use_onnx and onnx_available():
+                try:
+                    self.model = SentenceTransformer(self.model_name, backend='onnx')
+                    self.backend = 'onnx'
+                except Exception as e:  # older sentence-transformers, or the export failed
+                    print(f"Couldn't load the ONNX version ({e}), using PyTorch")
+            if self.quantize and self.backend != 'onnx':
+                print("INT8 quantization needs the ONNX Runtime backend, skipping it")
+            elif self.quantize:
+                quantized = self.load_quantized_model(SentenceTransformer)
+                if quantized is not None:
+                    self.model = quantized
+                    self.backend = 'onnx-int8'
+            if self.model is None:
+                self.model = SentenceTransformer(self.model_name)
+                if str(self.model.device).startswith('cuda'):
+                    self.use_half_precision()
+            
+            print(f"Loaded model: {self.model_name} ({self.backend}, {CPU_COUNT} CPU threads)")
             print(f" Embedding dimension: {self.model.get_sentence_embedding_dimension()}")
         except Exception as e:
             print(f" Error loading model: {e}")
             print("Try installing: pip install sentence-transformers")
             raise
+    
+    def load_quantized_model(self, SentenceTransformer):
+        """
+        Load the INT8 copy of the (ONNX) model, making it the first time
+        Returns None if it can't be made or its embeddings drift too far
+        """
+        save_dir = os.path.join(QUANTIZED_MODEL_DIR, self.model_name.replace('/', '_'))
         
-        self.embeddings = []
-        self.job_data = None
-        self.resume_embedding = None
+        try:
+            if not os.path.exists(os.path.join(save_dir, QUANTIZED_ONNX_FILE)):
+                print("Quantizing the model to INT8 (only happens once)...")
+                from sentence_transformers import export_dynamic_quantized_onnx_model
+                self.model.save_pretrained(save_dir)
+                export_dynamic_quantized_onnx_model(self.model, 'avx512_vnni', save_dir)
+            
+            quantized = SentenceTransformer(save_dir, backend='onnx',
+                                            model_kwargs={'file_name': QUANTIZED_ONNX_FILE})
+            
+            # rows are unit length, so the row-wise dot product is the cosine similarity
+            full = self.model.encode(PRECISION_CHECK_TEXTS, convert_to_numpy=True, normalize_embeddings=True)
+            small = quantized.encode(PRECISION_CHECK_TEXTS, convert_to_numpy=True, normalize_embeddings=True)
+            agreement = float(np.einsum('ij,ij->i', full, small).min())
+            if agreement < QUANTIZED_MIN_COSINE:
+                print(f"INT8 model drifts too far from the original (cosine {agreement:.4f}), not using it")
+                return None
+            
+            return quantized
+        except Exception as e:
+            print(f"Couldn't quantize the model ({e}), using full precision")
+            return None
+    
+    def use_half_precision(self):
+        """
+        Switch a GPU model to FP16 - about twice the throughput on tensor cores -
+        unless its embeddings come out noticeably different from FP32
+        """
+        try:
+            full = self.model.encode(PRECISION_CHECK_TEXTS, convert_to_numpy=True, normalize_embeddings=True)
+            self.model.half()
+            half = self.model.encode(PRECISION_CHECK_TEXTS, convert_to_numpy=True, normalize_embeddings=True)
+            
+            agreement = float(np.einsum('ij,ij->i', full, half.astype(np.float32)).min())
+            if agreement < FP16_MIN_COSINE:
+                print(f"FP16 embeddings drift too far from FP32 (cosine {agreement:.4f}), keeping FP32")
+                self.model.float()
+                return
+            
+            self.backend = 'torch-fp16'
+        except Exception as e:
+            print(f"Couldn't switch the model to FP16 ({e}), keeping FP32")
+            self.model.float()
+    
+    def warmup(self):
+        """
+        Run a few texts of different lengths through the model (one at a time, so
+        each length is its own shape) so the first real batches aren't slow
+        """
+        try:
+            with self.inference_mode():
+                self.model.encode(WARMUP_TEXTS, batch_size=1, show_progress_bar=False)
+        except Exception as e:
+            print(f"Model warm-up failed: {e}")
+    
+    def release_model(self):
+        """
+        Drop the model (and any GPU memory it held) once nothing else needs embedding
+        The next embed call loads it again
+        """
+        self.model = None
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
     
     def load_job_data(self, filename):
         """
@@ -48,13 +206,16 @@ class LLMEmbeddingGenerator:
         """
         try:
             if filename.endswith('.csv'):
-                self.job_data = pd.read_csv(filename)
+                self.job_data = read_jobs_csv(filename)
+            elif filename.endswith('.parquet'):
+                self.job_data = pd.read_parquet(filename)
             elif filename.endswith('.json'):
-                with open(filename, 'r') as f:
-                    jobs_list = json.load(f)
+                # orjson parses job lists several times faster than json
+                with open(filename, 'rb') as f:
+                    jobs_list = orjson.loads(f.read())
                 self.job_data = pd.DataFrame(jobs_list)
             else:
-                print("File must be .csv or .json")
+                print("File must be .csv, .parquet or .json")
                 return False
             
             print(f"Loaded {len(self.job_data)} jobs from {filename}")
@@ -64,40 +225,59 @@ class LLMEmbeddingGenerator:
             print(f"Error loading job data: {e}")
             return False
     
+    def load_job_data_from_records(self, records):
+        """
+        Load job data straight from a list of job dicts (no file needed)
+        """
+        try:
+            # empty strings become NaN, same as reading them back from a CSV
+            self.job_data = pd.DataFrame(records).replace('', np.nan)
+            print(f"Loaded {len(self.job_data)} jobs from memory")
+            return True
+            
+        except Exception as e:
+            print(f"Error loading job data: {e}")
+            return False
+    
     def prepare_job_text(self, job_row):
         """
-        Combine job fields into one text string for embedding
+        Combine one job's fields into one text string for embedding
         """
-        # Combine title, company, location, and description
-        text_parts = []
-        
-        # Add job title (most important)
-        if pd.notna(job_row.get('title')):
-            text_parts.append(f"Job Title: {job_row['title']}")
-        
-        # Add company
-        if pd.notna(job_row.get('company')) and job_row['company'] != 'No Company':
-            text_parts.append(f"Company: {job_row['company']}")
-        
-        # Add location
-        if pd.notna(job_row.get('location')) and job_row['location'] != 'No Location':
-            text_parts.append(f"Location: {job_row['location']}")
+        return self.prepare_job_texts(pd.DataFrame([job_row]))[0]
+    
+    def prepare_job_texts(self, jobs):
+        """
+        Combine job fields into one text string per job for embedding, using
+        pandas string ops on whole columns instead of going row by row
+        """
+        # each part gets a " | " in front so skipped parts just drop out, then the first one is cut off
+        combined = pd.Series('', index=jobs.index, dtype=object)
         
-        # Add description (most content)
-        if pd.notna(job_row.get('description')) and job_row['description'] != 'No Description':
-            desc = str(job_row['description'])
-            # Limit description length for consistency
-            if len(desc) > 1000:
-                desc = desc[:1000] + "..."
-            text_parts.append(f"Description: {desc}")
+        for label, column, placeholder in [('Job Title', 'title', None), ('Company', 'company', 'No Company'),
+                                           ('Location', 'location', 'No Location'),
+                                           ('Description', 'description', 'No Description')]:
+            if column not in jobs.columns:
+                continue
+            
+            values = jobs[column]
+            keep = values.notna()
+            if placeholder:
+                keep &= values != placeholder
+            
+            text = values.astype(str)
+            if column == 'description':
+                # Limit description length for consistency
+                text = text.where(text.str.len() <= 1000, text.str.slice(0, 1000) + "...")
+            
+            combined += (f" | {label}: " + text).where(keep, '')
         
-        # Join all parts
-        combined_text = " | ".join(text_parts)
-        return combined_text
+        return combined.str.slice(3).tolist()
     
-    def embed_all_jobs(self):
+    def embed_all_jobs(self, resume_text=None):
         """
         Generate embeddings for all job postings using local LLM!
+        If resume_text is given, the resume rides along in the same batches
+        as the jobs instead of needing its own encode call afterwards
         """
         if self.job_data is None:
             print(" No job data loaded!")
@@ -107,32 +287,22 @@ class LLMEmbeddingGenerator:
         print("This runs on your computer - no internet needed!")
         
         # Prepare all job texts
-        job_texts = []
-        job_metadata = []
-        
-        for index, job in self.job_data.iterrows():
-            job_text = self.prepare_job_text(job)
-            job_texts.append(job_text)
-            
-            job_metadata.append({
-                'job_index': index,
-                'title': job.get('title', 'Unknown'),
-                'company': job.get('company', 'Unknown'),
-                'location': job.get('location', 'Unknown'),
-                'text_used': job_text[:200] + "..." if len(job_text) > 200 else job_text
-            })
+        job_texts = self.prepare_job_texts(self.job_data)
+        job_metadata = self.job_metadata(job_texts)
         
         # Generate embeddings in batch (much faster!)
         print("Computing embeddings...")
         try:
-            # This is the magic - all embeddings at once, locally!
-            embeddings = self.model.encode(job_texts, show_progress_bar=True)
-            
-            # Combine metadata with embeddings
-            for i, embedding in enumerate(embeddings):
-                job_metadata[i]['embedding'] = embedding.tolist()  # Convert to list for JSON
+            # This is the magic - all embeddings in a few big batches, locally!
+            if resume_text is None:
+                embeddings = self.embed_batch(job_texts)
+            else:
+                embeddings = self.embed_batch(job_texts + [self.prepare_resume_text(resume_text)])
+                self.resume_embedding = embeddings[-1].tolist()  # Convert to list for JSON
+                embeddings = embeddings[:-1]
+                print(" Resume embedding generated successfully")
             
-            self.embeddings = job_metadata
+            self.set_job_embeddings(embeddings, job_metadata)
             print(f" Successfully embedded {len(embeddings)} jobs!")
             return True
             
@@ -140,19 +310,137 @@ class LLMEmbeddingGenerator:
             print(f"Error generating embeddings: {e}")
             return False
     
-    def embed_resume(self, resume_text):
+    def job_metadata(self, job_texts):
         """
-        Generate embedding for student's resume using local LLM!
+        Per-job info that gets saved along with the embeddings
         """
-        print("Generating LLM embedding for resume...")
+        fields = {}
+        for field in ['title', 'company', 'location']:
+            if field in self.job_data.columns:
+                fields[field] = self.job_data[field].tolist()
+            else:
+                fields[field] = ['Unknown'] * len(self.job_data)
+        
+        return [
+            {
+                'job_index': index,
+                'title': title,
+                'company': company,
+                'location': location,
+                'text_used': job_text[:200] + "..." if len(job_text) > 200 else job_text
+            }
+            for index, title, company, location, job_text in zip(
+                self.job_data.index, fields['title'], fields['company'], fields['location'], job_texts)
+        ]
+    
+    def set_job_embeddings(self, embeddings, job_metadata=None):
+        """
+        Use an (N, D) matrix of embeddings for the loaded jobs, either fresh from
+        embed_all_jobs or computed earlier (so save_embeddings works without the model)
+        """
+        if job_metadata is None:
+            job_metadata = self.job_metadata(self.prepare_job_texts(self.job_data))
+        
+        # Keep the raw (N, D) array around for code that wants the matrix
+        self.embedding_matrix = embeddings
+        
+        # Combine metadata with embeddings (rows of the matrix, not copies)
+        for i, embedding in enumerate(embeddings):
+            job_metadata[i]['embedding'] = embedding
+        
+        self.embeddings = job_metadata
+    
+    def inference_mode(self):
+        """
+        torch.inference_mode() for the PyTorch backends - no autograd bookkeeping at all,
+        even around code that doesn't turn it off itself. Does nothing for ONNX
+        """
+        if self.backend.startswith('torch'):
+            try:
+                import torch
+                return torch.inference_mode()
+            except ImportError:
+                pass
+        return contextlib.nullcontext()
+    
+    def token_lengths(self, texts):
+        """
+        How many tokens each text becomes after truncation - what it really gets padded to
+        Falls back to a rough 4 characters per token if the model's tokenizer can't be called
+        """
+        try:
+            return self.model.tokenizer(texts, truncation=True, max_length=self.model.max_seq_length,
+                                        return_length=True)['length']
+        except Exception:
+            return [len(text) // 4 + 1 for text in texts]
+    
+    def embed_batch(self, texts, batch_size=128, max_tokens=32_768):
+        """
+        Embed a list of texts in length-sorted batches that stay under a token budget
+        Results come back in the original order as unit-length float32 rows,
+        so cosine similarity later on is just a dot product
+        If a batch runs out of memory, that batch is retried one text at a time
+        """
+        if self.model is None:
+            self.load_model()
+        
+        # identical texts (reposted / cross-posted jobs) only go through the model once
+        index_of = {}
+        inverse = np.fromiter((index_of.setdefault(text, len(index_of)) for text in texts),
+                              dtype=np.intp, count=len(texts))
+        if len(index_of) < len(texts):
+            return self.embed_batch(list(index_of), batch_size, max_tokens)[inverse]
+        
+        embeddings = np.empty((len(texts), self.model.get_sentence_embedding_dimension()), dtype=np.float32)
         
-        # Clean up resume text a bit
+        # sort by token count so texts in a batch are about the same size and
+        # don't get padded out to one long description, then group them so
+        # the padded batch (longest text * batch size) stays under max_tokens.
+        # Everything past max_seq_length gets cut off, so long descriptions all
+        # count the same and end up sharing full-size batches
+        lengths = self.token_lengths(texts)
+        order = sorted(range(len(texts)), key=lambda i: lengths[i])
+        batches = []
+        current = []
+        for i in order:
+            if current and (len(current) >= batch_size or lengths[i] * (len(current) + 1) > max_tokens):
+                batches.append(current)
+                current = []
+            current.append(i)
+        if current:
+            batches.append(current)
+        
+        with self.inference_mode():
+            for batch in batches:
+                batch_texts = [texts[i] for i in batch]
+                try:
+                    embeddings[batch] = self.model.encode(batch_texts, batch_size=len(batch_texts), show_progress_bar=False,
+                                                           convert_to_numpy=True, normalize_embeddings=True)
+                except RuntimeError as e:  # torch raises out-of-memory as a RuntimeError
+                    print(f"Batch of {len(batch_texts)} failed ({e}), retrying one at a time...")
+                    for i, text in zip(batch, batch_texts):
+                        embeddings[i] = self.model.encode([text], show_progress_bar=False,
+                                                           convert_to_numpy=True, normalize_embeddings=True)[0]
+        
+        return embeddings
+    
+    def prepare_resume_text(self, resume_text):
+        """
+        Clean up resume text a bit before embedding
+        """
         if len(resume_text) > 2000:  # Reasonable length
             resume_text = resume_text[:2000] + "..."
+        return resume_text
+    
+    def embed_resume(self, resume_text):
+        """
+        Generate embedding for student's resume using local LLM!
+        """
+        print("Generating LLM embedding for resume...")
         
         try:
             # Generate embedding locally
-            embedding = self.model.encode([resume_text])
+            embedding = self.embed_batch([self.prepare_resume_text(resume_text)])
             self.resume_embedding = embedding[0].tolist()  # Convert to list for JSON
             
             print(" Resume embedding generated successfully")
@@ -162,20 +450,29 @@ class LLMEmbeddingGenerator:
             print(f" Error generating resume embedding: {e}")
             return False
     
-    def load_resume_from_file(self, filename):
+    def read_resume_file(self, filename):
         """
-        Load resume text from a file
+        Read resume text from a file (None if it can't be read)
         """
         try:
             with open(filename, 'r', encoding='utf-8') as f:
                 resume_text = f.read()
             
             print(f"Loaded resume from {filename}")
-            return self.embed_resume(resume_text)
+            return resume_text
             
         except Exception as e:
             print(f"Error loading resume file: {e}")
+            return None
+    
+    def load_resume_from_file(self, filename):
+        """
+        Load resume text from a file and embed it
+        """
+        resume_text = self.read_resume_file(filename)
+        if resume_text is None:
             return False
+        return self.embed_resume(resume_text)
     
     def save_embeddings(self):
         """
@@ -187,30 +484,25 @@ class LLMEmbeddingGenerator:
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # Save job embeddings
-        job_embeddings_file = f"job_embeddings_llm_{timestamp}.json"
+        # Save the job matrix and the resume together in one binary file -
+        # JSON lists of floats are ~30x bigger and much slower to read back.
+        # The job matrix goes in as float16 to halve the file again, the low bits
+        # don't change which jobs match (the matcher turns it back into float32)
+        embeddings_file = f"embeddings_llm_{timestamp}.npz"
         
         try:
-            with open(job_embeddings_file, 'w') as f:
-                json.dump(self.embeddings, f, indent=2)
-            print(f"Saved job embeddings to {job_embeddings_file}")
+            resume = np.asarray(self.resume_embedding if self.resume_embedding else [], dtype=np.float32)
+            np.savez_compressed(
+                embeddings_file,
+                jobs=self.embedding_matrix.astype(np.float16),
+                resume=resume,
+                ids=np.array([job['job_index'] for job in self.embeddings]),
+                model=np.array(self.model_name),
+                norm=np.array('l2')  # embed_batch rows are unit length
+            )
+            print(f"Saved job and resume embeddings to {embeddings_file}")
         except Exception as e:
-            print(f" Error saving job embeddings: {e}")
-        
-        # Save resume embedding
-        if self.resume_embedding:
-            resume_embedding_file = f"resume_embedding_llm_{timestamp}.json"
-            try:
-                with open(resume_embedding_file, 'w') as f:
-                    json.dump({
-                        'embedding': self.resume_embedding,
-                        'timestamp': timestamp,
-                        'model': self.model_name,
-                        'dimension': len(self.resume_embedding)
-                    }, f, indent=2)
-                print(f"Saved resume embedding to {resume_embedding_file}")
-            except Exception as e:
-                print(f"Error saving resume embedding: {e}")
+            print(f" Error saving embeddings: {e}")
         
         # Save a summary
         summary_file = f"embedding_summary_llm_{timestamp}.txt"
@@ -244,7 +536,7 @@ class LLMEmbeddingGenerator:
             print(f"Company: {item['company']}")
             print(f"Text used: {item['text_used']}")
             print(f"Embedding dimension: {len(item['embedding'])}")
-            print(f"First 5 embedding values: {item['embedding'][:5]}")
+            print(f"First 5 embedding values: {item['embedding'][:5].tolist()}")
             print("-" * 40)
         
         if self.resume_embedding:
@@ -309,19 +601,26 @@ def check_model_availability():
     """
     Check if sentence-transformers is installed and working
     """
-    try:
-        from sentence_transformers import SentenceTransformer
+    # find_spec only looks the package up, it doesn't import torch
+    if importlib.util.find_spec('sentence_transformers') is not None:
         print("sentence-transformers is installed")
         return True
-    except ImportError:
+    else:
         print("sentence-transformers not installed")
         print("Install with: pip install sentence-transformers")
         return False
 
-def main():
+def main(argv=None):
     """
     Main function to run the LLM embedding generation
     """
+    parser = argparse.ArgumentParser(description="Stage 3: generate job and resume embeddings")
+    parser.add_argument('-y', '--yes', action='store_true', help="don't ask anything, use the default model")
+    parser.add_argument('--data-file', help="job data file from Stage 1")
+    parser.add_argument('--resume', help="resume text file (default with --yes: a sample resume)")
+    parser.add_argument('--int8', action='store_true', help="run an INT8-quantized copy of the model (needs onnxruntime)")
+    args = parser.parse_args(argv)
+    
     print("=== Stage 3: LLM Embedding Generator ===")
     print("This will convert your job data and resume into vector embeddings")
     print("Uses local LLM models - No API keys")
@@ -343,7 +642,7 @@ def main():
     for key, (name, desc) in models.items():
         print(f"  {key}. {name} - {desc}")
     
-    choice = input("Choose model (1-3, or press Enter for default): ").strip()
+    choice = "" if args.yes else input("Choose model (1-3, or press Enter for default): ").strip()
     
     if choice in models:
         model_name = models[choice][0]
@@ -354,22 +653,29 @@ def main():
     
     # Create embedding generator
     try:
-        embedder = LLMEmbeddingGenerator(model_name=model_name)
+        embedder = LLMEmbeddingGenerator(model_name=model_name, quantize=args.int8)
     except Exception as e:
         print(f"Could not load embedding model: {e}")
         return
     
+    # warm the model up in the background while the job data and resume get loaded
+    warmup_thread = threading.Thread(target=embedder.warmup, daemon=True)
+    warmup_thread.start()
+    
     # Load job data from Stage 1
     print("\nLooking for job data files...")
     job_files = ['final_jobs.csv', 'job_postings.csv', 'scraped_jobs.csv']
-    job_file = None
+    job_file = args.data_file
     
-    for filename in job_files:
+    for filename in ([] if job_file else job_files):
         if os.path.exists(filename):
             job_file = filename
             print(f"Found: {filename}")
             break
     
+    if not job_file and args.yes:
+        print("No job data file found! Pass one with --data-file")
+        return
     if not job_file:
         job_file = input("Enter job data filename: ").strip()
     
@@ -384,15 +690,23 @@ def main():
     print("2. Create a sample resume for testing")
     print("3. Enter resume text manually")
     
-    choice = input("Choose option (1-3): ").strip()
+    if args.resume:
+        choice = "1"
+    elif args.yes:
+        choice = "2"
+    else:
+        choice = input("Choose option (1-3): ").strip()
     
+    # the resume only gets read here, it's embedded together with the jobs below
     if choice == "1":
-        resume_file = input("Enter resume filename: ").strip()
-        if not embedder.load_resume_from_file(resume_file):
+        resume_file = args.resume or input("Enter resume filename: ").strip()
+        resume_text = embedder.read_resume_file(resume_file)
+        if resume_text is None:
             return
     elif choice == "2":
         resume_file = create_sample_resume()
-        if not embedder.load_resume_from_file(resume_file):
+        resume_text = embedder.read_resume_file(resume_file)
+        if resume_text is None:
             return
     elif choice == "3":
         print("Enter your resume text (press Ctrl+D when done):")
@@ -404,8 +718,6 @@ def main():
         except EOFError:
             pass
         resume_text = "\n".join(resume_lines)
-        if not embedder.embed_resume(resume_text):
-            return
     else:
         print("Invalid choice!")
         return
@@ -416,13 +728,15 @@ def main():
     print(" ")
     print(f"{'='*50}")
     
-    proceed = input("Proceed? (y/n): ").strip().lower()
-    if proceed not in ['y', 'yes']:
-        print("Cancelled.")
-        return
+    if not args.yes:
+        proceed = input("Proceed? (y/n): ").strip().lower()
+        if proceed not in ['y', 'yes']:
+            print("Cancelled.")
+            return
     
-    # Embed all jobs
-    if embedder.embed_all_jobs():
+    # Embed all jobs (and the resume, in the same batches)
+    warmup_thread.join()
+    if embedder.embed_all_jobs(resume_text=resume_text):
         # Save everything to CSV/JSON files
         embedder.save_embeddings()
         
@@ -436,8 +750,7 @@ def main():
         print(f"Total cost: $0.00") ## show that it is free because no API keys
         
         print(f"\nFiles created:")
-        print(f"  - job_embeddings_llm_*.json (job embeddings)")
-        print(f"  - resume_embedding_llm_*.json (your resume embedding)")
+        print(f"  - embeddings_llm_*.npz (job and resume embeddings)")
         print(f"  - embedding_summary_llm_*.txt (summary info)")
         
     else:
@@ -8,12 +8,131 @@ the most similar jobs using cosine similarity.
 
 import pandas as pd
 import json
+import orjson
 import numpy as np
 from datetime import datetime
 import os
+import argparse
+from functools import lru_cache
 
-# For cosine similarity calculation
-from scipy.spatial.distance import cosine
+# For cosine similarity calculation - simsimd has fast SIMD kernels,
+# plain numpy works fine if it isn't installed
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+# Below this many jobs the CPU is already fast enough that copying to a GPU
+# (and importing torch just to look for one) isn't worth it
+GPU_MIN_JOBS = 10_000
+
+# int8 rows get turned into float32 this many at a time, so a big (memory-mapped)
+# matrix is read through once instead of being copied out at 4x its size
+DOT_BLOCK_ROWS = 8192
+
+
+def quantize_embeddings(embeddings):
+    """
+    Store each embedding as int8, scaled so its largest value maps to 127
+    Cosine similarity doesn't care about the per-vector scale, so it isn't kept
+    """
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    scale = 127 / np.maximum(np.abs(matrix).max(axis=1, keepdims=True), 1e-12)
+    return np.round(matrix * scale).astype(np.int8)
+
+
+def blocked_dot(job_matrix, vector):
+    """
+    job_matrix @ vector for float32 or int8 rows, converting at most DOT_BLOCK_ROWS
+    int8 rows to float32 at a time
+    """
+    vector = np.ascontiguousarray(vector, dtype=np.float32)
+    if job_matrix.dtype == np.float32:
+        return job_matrix @ vector
+    
+    dots = np.empty(len(job_matrix), dtype=np.float32)
+    for start in range(0, len(job_matrix), DOT_BLOCK_ROWS):
+        block = np.asarray(job_matrix[start:start + DOT_BLOCK_ROWS], dtype=np.float32)
+        dots[start:start + len(block)] = block @ vector
+    return dots
+
+
+def find_latest_file(patterns):
+    """
+    Newest file in the current folder for the first (prefix, suffix) pattern that matches anything
+    One os.scandir pass with one stat per matching file, instead of a glob per pattern
+    plus a getctime call per match
+    """
+    newest = [None] * len(patterns)  # (ctime, name) per pattern
+    with os.scandir('.') as entries:
+        for entry in entries:
+            for i, (prefix, suffix) in enumerate(patterns):
+                if entry.name.startswith(prefix) and entry.name.endswith(suffix) and entry.is_file():
+                    ctime = entry.stat().st_ctime
+                    if newest[i] is None or ctime > newest[i][0]:
+                        newest[i] = (ctime, entry.name)
+                    break
+    
+    for found in newest:
+        if found:
+            return found[1]
+    return None
+
+
+@lru_cache(maxsize=1)
+def _cuda_torch():
+    """torch, if it's installed and there is a CUDA GPU to use"""
+    try:
+        import torch
+    except ImportError:
+        return None
+    return torch if torch.cuda.is_available() else None
+
+
+def cuda_cosine_similarities(job_embeddings, resume_embedding):
+    """
+    Cosine similarity computed on the GPU, or None if there's no CUDA GPU
+    """
+    torch = _cuda_torch()
+    if torch is None:
+        return None
+    
+    # np.require copies read-only (memory-mapped) arrays, torch wants writable ones
+    jobs = torch.from_numpy(np.require(job_embeddings, requirements=['C', 'W'])).to('cuda').float()
+    resume = torch.from_numpy(np.require(resume_embedding, dtype=np.float32, requirements=['C', 'W'])).to('cuda')
+    similarities = torch.nn.functional.cosine_similarity(jobs, resume.unsqueeze(0), dim=1)
+    return similarities.cpu().numpy()
+
+
+def cosine_similarities(job_embeddings, resume_embedding):
+    """
+    Cosine similarity between the resume and every job embedding in one call
+    Job embeddings can be float or int8 (from quantize_embeddings)
+    Large job sets go to the GPU if there is one
+    """
+    job_matrix = np.asarray(job_embeddings)
+    if len(job_matrix) >= GPU_MIN_JOBS:
+        similarities = cuda_cosine_similarities(job_matrix, resume_embedding)
+        if similarities is not None:
+            return similarities
+    
+    if job_matrix.dtype != np.int8:
+        job_matrix = np.ascontiguousarray(job_matrix, dtype=np.float32)
+    resume_vec = np.ascontiguousarray(resume_embedding, dtype=np.float32)
+    
+    if simsimd is not None:
+        if job_matrix.dtype == np.int8:
+            # the int8 kernels need both sides quantized
+            resume_vec = quantize_embeddings(resume_vec[None, :])[0]
+        distances = np.asarray(simsimd.cdist(resume_vec[None, :], job_matrix, metric="cosine"))
+        return 1 - distances[0]
+    
+    if job_matrix.dtype == np.int8:
+        job_norms = np.sqrt(np.einsum('ij,ij->i', job_matrix, job_matrix, dtype=np.float32, casting='unsafe'))
+    else:
+        job_norms = np.linalg.norm(job_matrix, axis=1)
+    job_norms *= np.linalg.norm(resume_vec)
+    return blocked_dot(job_matrix, resume_vec) / (job_norms + 1e-12)
 
 class SimpleJobMatcher:
     def __init__(self):
@@ -21,30 +140,42 @@ class SimpleJobMatcher:
         self.resume_embedding = None
         self.job_data = []
         self.similarities = []
+        self.unit_norm = False  # True when the job embeddings are already normalized
     
     def load_job_embeddings(self, embeddings_file):
         """
-        Load job embeddings from file (JSON or NPY format)
+        Load job embeddings from file (JSON, NPY or the NPZ from Stage 3)
         Expected format: list of embeddings or numpy array
         """
         print(f"Loading job embeddings from {embeddings_file}...")
         
         try:
             if embeddings_file.endswith('.json'):
-                with open(embeddings_file, 'r') as f:
-                    self.job_embeddings = json.load(f)
+                # orjson parses float lists several times faster than json
+                with open(embeddings_file, 'rb') as f:
+                    self.job_embeddings = orjson.loads(f.read())
                 print(f"Loaded {len(self.job_embeddings)} job embeddings from JSON")
             
             elif embeddings_file.endswith('.npy'):
-                self.job_embeddings = np.load(embeddings_file)
+                # memory-map instead of reading the whole file up front
+                self.job_embeddings = np.load(embeddings_file, mmap_mode='r')
                 print(f"Loaded {len(self.job_embeddings)} job embeddings from NPY")
             
+            elif embeddings_file.endswith('.npz'):
+                with np.load(embeddings_file) as data:
+                    self.job_embeddings = data['jobs']
+                    self.unit_norm = 'norm' in data.files and str(data['norm']) == 'l2'
+                print(f"Loaded {len(self.job_embeddings)} job embeddings from NPZ")
+            
             else:
-                print("Embeddings file must be .json or .npy format")
+                print("Embeddings file must be .json, .npy or .npz format")
                 return False
             
-            # Convert to numpy array for easier computation
-            self.job_embeddings = np.array(self.job_embeddings)
+            # One contiguous float32 (or int8, if quantized) matrix, so the
+            # similarity step is a single call
+            self.job_embeddings = np.asarray(self.job_embeddings)
+            if self.job_embeddings.dtype != np.int8:
+                self.job_embeddings = np.ascontiguousarray(self.job_embeddings, dtype=np.float32)
             return True
             
         except Exception as e:
@@ -59,18 +190,22 @@ class SimpleJobMatcher:
         
         try:
             if resume_embedding_file.endswith('.json'):
-                with open(resume_embedding_file, 'r') as f:
-                    self.resume_embedding = json.load(f)
+                with open(resume_embedding_file, 'rb') as f:
+                    self.resume_embedding = orjson.loads(f.read())
             
             elif resume_embedding_file.endswith('.npy'):
                 self.resume_embedding = np.load(resume_embedding_file)
             
+            elif resume_embedding_file.endswith('.npz'):
+                with np.load(resume_embedding_file) as data:
+                    self.resume_embedding = data['resume']
+            
             else:
-                print("Resume embedding file must be .json or .npy format")
+                print("Resume embedding file must be .json, .npy or .npz format")
                 return False
             
             # Convert to numpy array
-            self.resume_embedding = np.array(self.resume_embedding)
+            self.resume_embedding = np.ascontiguousarray(self.resume_embedding, dtype=np.float32)
             print(f"Loaded resume embedding (dimension: {len(self.resume_embedding)})")
             return True
             
@@ -90,12 +225,16 @@ class SimpleJobMatcher:
                 df = pd.read_csv(job_data_file)
                 self.job_data = df.to_dict('records')
             
+            elif job_data_file.endswith('.parquet'):
+                df = pd.read_parquet(job_data_file)
+                self.job_data = df.to_dict('records')
+            
             elif job_data_file.endswith('.json'):
                 with open(job_data_file, 'r') as f:
                     self.job_data = json.load(f)
             
             else:
-                print(" Job data file must be .csv or .json format")
+                print(" Job data file must be .csv, .parquet or .json format")
                 return False
             
             print(f"Loaded {len(self.job_data)} job records")
@@ -125,25 +264,17 @@ class SimpleJobMatcher:
             print(f"   Job records: {len(self.job_data)}")
             return False
         
-        self.similarities = []
-        
-        # Calculate similarity for each job
-        for i, job_embedding in enumerate(self.job_embeddings):
-            try:
-                # Calculate cosine similarity
-                # Note: scipy.spatial.distance.cosine gives cosine DISTANCE
-                # So similarity = 1 - distance
-                cosine_distance = cosine(self.resume_embedding, job_embedding)
-                similarity = 1 - cosine_distance
-                
-                self.similarities.append(similarity)
-                
-                if i % 10 == 0:  # Progress update every 10 jobs
-                    print(f"  Processed {i+1}/{len(self.job_embeddings)} jobs...")
-                
-            except Exception as e:
-                print(f" Error calculating similarity for job {i}: {e}")
-                self.similarities.append(0.0)  # Default to 0 similarity
+        # Calculate similarity for all jobs at once
+        try:
+            if self.unit_norm and self.job_embeddings.dtype == np.float32:
+                # rows are already unit length, so cosine is a single matrix-vector product
+                resume = self.resume_embedding / (np.linalg.norm(self.resume_embedding) + 1e-12)
+                self.similarities = self.job_embeddings @ resume
+            else:
+                self.similarities = cosine_similarities(self.job_embeddings, self.resume_embedding)
+        except Exception as e:
+            print(f" Error calculating similarities: {e}")
+            return False
         
         print(f" Calculated similarities for {len(self.similarities)} jobs")
         return True
@@ -152,26 +283,27 @@ class SimpleJobMatcher:
         """
         Get the top N most similar jobs
         """
-        if not self.similarities:
+        if len(self.similarities) == 0:
             print(" No similarities calculated yet")
             return []
         
         print(f"Finding top {top_n} most similar jobs...")
         
-        # Create list of (similarity, job_index) pairs
-        job_similarities = list(enumerate(self.similarities))
-        
-        # Sort by similarity (descending)
-        job_similarities.sort(key=lambda x: x[1], reverse=True)
+        # Pick the top N without sorting every job, then sort just those
+        scores = np.asarray(self.similarities)
+        top_n = min(top_n, len(scores))
+        if top_n < len(scores):
+            top_idx = np.argpartition(-scores, top_n)[:top_n]
+        else:
+            top_idx = np.arange(len(scores))
+        top_idx = top_idx[np.argsort(-scores[top_idx], kind='stable')]
         
         # Get top N
         top_jobs = []
-        for i in range(min(top_n, len(job_similarities))):
-            job_index, similarity = job_similarities[i]
-            
+        for i, job_index in enumerate(top_idx):
             # Get job data
             job = self.job_data[job_index].copy()
-            job['similarity_score'] = similarity
+            job['similarity_score'] = float(scores[job_index])
             job['rank'] = i + 1
             
             top_jobs.append(job)
@@ -223,8 +355,8 @@ class SimpleJobMatcher:
             filename = f"top_jobs_{timestamp}.json"
         
         try:
-            with open(filename, 'w') as f:
-                json.dump(top_jobs, f, indent=2)
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(top_jobs, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
             print(f"Saved top jobs to {filename}")
             
             # Also save as CSV for easy viewing
@@ -288,10 +420,15 @@ class SimpleJobMatcher:
             if source != 'Unknown':
                 print(f"  {source}: {count} job(s)")
 
-def main():
+def main(argv=None):
     """
     Main function to run the job matching
     """
+    parser = argparse.ArgumentParser(description="Match your resume against job embeddings")
+    parser.add_argument('-y', '--yes', action='store_true', help="don't ask for confirmation")
+    parser.add_argument('--data-file', help="job data file to use instead of the newest final_jobs_* file")
+    args = parser.parse_args(argv)
+    
     print("=== Simple Job Matcher - Stage 4 ===")
     print("This will find the most similar jobs to your resume using embeddings")
     
@@ -299,58 +436,46 @@ def main():
     print("\nLooking for required files...")
     
     # Look for job embeddings
-    job_embedding_files = []
-    for ext in ['*.json', '*.npy']:
-        import glob
-        files = glob.glob(f"job_embeddings{ext}")
-        job_embedding_files.extend(files)
+    # the newest Stage 3 run (one .npz with jobs + resume) wins over older formats
+    job_embeddings_file = find_latest_file([('embeddings_llm_', '.npz')] +
+                                           [(f"job_embeddings{ext}", '') for ext in ['_i8.npy', '.npy', '.json']])
     
-    if not job_embedding_files:
+    if not job_embeddings_file:
         print(" No job embedding files found!")
-        print("   Expected files: job_embeddings.json or job_embeddings.npy")
+        print("   Expected files: embeddings_llm_*.npz, job_embeddings.npy or job_embeddings.json")
         print("   Make sure you've completed Stage 3 (Embedding Generation)")
         return
     
     # Look for resume embedding
-    resume_embedding_files = []
-    for ext in ['*.json', '*.npy']:
-        files = glob.glob(f"resume_embedding{ext}")
-        resume_embedding_files.extend(files)
+    resume_embedding_file = find_latest_file([('embeddings_llm_', '.npz')] +
+                                             [(f"resume_embedding{ext}", '') for ext in ['_i8.npy', '.npy', '.json']])
     
-    if not resume_embedding_files:
+    if not resume_embedding_file:
         print("No resume embedding files found!")
-        print("   Expected files: resume_embedding.json or resume_embedding.npy")
+        print("   Expected files: embeddings_llm_*.npz, resume_embedding.npy or resume_embedding.json")
         print("   Make sure you've completed Stage 3 (Embedding Generation)")
         return
     
-    # Look for job data
-    job_data_files = []
-    import glob
-    for pattern in ['final_jobs_*.csv', 'final_jobs_*.json', 'job_postings.csv']:
-        files = glob.glob(pattern)
-        job_data_files.extend(files)
+    # Look for job data, newest run first
+    job_data_file = args.data_file or find_latest_file([('final_jobs_', '.parquet'), ('final_jobs_', '.csv'), ('final_jobs_', '.json'), ('job_postings.csv', '')])
     
-    if not job_data_files:
+    if not job_data_file:
         print(" No job data files found!")
         print("   Expected files: final_jobs_*.csv, job_postings.csv, etc.")
         print("   Make sure you've completed Stage 1 (Data Collection)")
         return
     
-    # Use the first found files
-    job_embeddings_file = job_embedding_files[0]
-    resume_embedding_file = resume_embedding_files[0]
-    job_data_file = job_data_files[0]
-    
     print(f" Using files:")
     print(f"   Job embeddings: {job_embeddings_file}")
     print(f"   Resume embedding: {resume_embedding_file}")
     print(f"   Job data: {job_data_file}")
     
     # Ask user if they want to proceed
-    response = input("\nProceed with job matching? (y/n): ").strip().lower()
-    if response not in ['y', 'yes']:
-        print("Cancelled.")
-        return
+    if not args.yes:
+        response = input("\nProceed with job matching? (y/n): ").strip().lower()
+        if response not in ['y', 'yes']:
+            print("Cancelled.")
+            return
     
     # Create matcher and load data
     matcher = SimpleJobMatcher()
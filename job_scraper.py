@@ -8,12 +8,11 @@ it reads robots.txt to make sure it can take stuff
 
 import requests
 from bs4 import BeautifulSoup
-import json
+import orjson
 import csv
 import time
 import random
 from datetime import datetime
-import pandas as pd
 
 class SimpleJobScraper:
     def __init__(self, location="St. Louis, MO", keywords="computer science"):
@@ -136,6 +135,8 @@ class SimpleJobScraper:
             return
         
         try:
+            # Only load pandas when we actually save (it's slow to import)
+            import pandas as pd
             df = pd.DataFrame(self.jobs)
             df.to_csv(filename, index=False)
             print(f"Saved {len(self.jobs)} jobs to {filename}")
@@ -151,8 +152,8 @@ class SimpleJobScraper:
             return
         
         try:
-            with open(filename, 'w') as f:
-                json.dump(self.jobs, f, indent=2)
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(self.jobs, option=orjson.OPT_INDENT_2))
             print(f"Saved {len(self.jobs)} jobs to {filename}")
         except Exception as e:
             print(f"Error saving to JSON: {e}")
@@ -8,6 +8,8 @@ change test_file
 import os
 import sys
 import subprocess
+import threading
+from collections import deque
 import pandas as pd
 
 def print_test(test_name):
@@ -32,24 +34,42 @@ def test_sample_data():
     """Test 2: Run the test script"""
     print_test("Sample Data Test")
     
+    # stream the output as it comes instead of holding all of it until the
+    # script exits, only the last few lines are kept for the error report
+    tail = deque(maxlen=200)
+    
     try:
-        result = subprocess.run([sys.executable, 'test_stage2.py'], 
-                              capture_output=True, text=True, timeout=60)
+        with subprocess.Popen([sys.executable, 'test_stage2.py'], stdout=subprocess.PIPE,
+                              stderr=subprocess.STDOUT, text=True, bufsize=1) as process:
+            # kill the script if it takes too long
+            timed_out = threading.Event()
+            
+            def stop_test():
+                timed_out.set()
+                process.kill()
+            
+            timer = threading.Timer(60, stop_test)
+            timer.start()
+            try:
+                for line in process.stdout:
+                    print(line, end='')
+                    tail.append(line)
+                process.wait()
+            finally:
+                timer.cancel()
         
-        if result.returncode == 0:
+        if process.returncode == 0:
             print(" test_stage2.py ran successfully!")
-            print("Output:")
-            print(result.stdout[-500:])  # Last 500 characters
             return True
+        elif timed_out.is_set():
+            print("Test timed out (took too long)")
+            return False
         else:
             print(f" test_stage2.py failed!")
             print("Error:")
-            print(result.stderr)
+            print(''.join(tail))
             return False
             
-    except subprocess.TimeoutExpired:
-        print("Test timed out (took too long)")
-        return False
     except Exception as e:
         print(f" Error running test: {e}")
         return False
@@ -37,8 +37,9 @@ def install_packages():
     packages = [
         "requests",
         "beautifulsoup4", 
-        "pandas",
-        "lxml"
+        "pandas>=1.5.0",
+        "lxml",
+        "orjson"
     ]
     
     failed = []
@@ -70,7 +71,8 @@ def test_imports():
     packages_to_test = [
         ('requests', 'requests'),
         ('BeautifulSoup', 'bs4'),
-        ('pandas', 'pandas')
+        ('pandas', 'pandas'),
+        ('orjson', 'orjson')
     ]
     
     all_good = True
@@ -108,6 +110,9 @@ def create_gitignore():
 *.json
 data/
 reports/
+embedding_cache/
+quantized_models/
+.pipeline_cache
 
 # Don't commit Python cache
 __pycache__/
@@ -219,6 +224,7 @@ def main():
         'job_scraper.py',
         'api_scraper.py', 
         'data_validator.py',
+        'data_loader.py',
         'config.py',
         'stage1_complete.py'
     ]
@@ -11,7 +11,13 @@ job data and check its quality.
 import os
 from datetime import datetime
 import pandas as pd
-import json
+import orjson
+
+# Parquet copies of the final data need pyarrow, the CSV/JSON files are always written
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
 
 # Import our other modules
 try:
@@ -20,7 +26,7 @@ try:
     from data_validator import SimpleDataChecker
 except ImportError:
     print("Error: Make sure all files are in the same directory!")
-    print("Required files: job_scraper.py, api_scraper.py, data_validator.py")
+    print("Required files: job_scraper.py, api_scraper.py, data_validator.py, data_loader.py")
     exit(1)
 
 def print_header(text):
@@ -132,13 +138,19 @@ def step3_combine_data(scraped_jobs, api_jobs):
         
         # Save to JSON  
         json_filename = f"final_jobs_{timestamp}.json"
-        with open(json_filename, 'w') as f:
-            json.dump(unique_jobs, f, indent=2)
+        with open(json_filename, 'wb') as f:
+            f.write(orjson.dumps(unique_jobs, option=orjson.OPT_INDENT_2))
         
         print(f"Combined data saved to:")
         print(f"  - {csv_filename}")
         print(f"  - {json_filename}")
         
+        # Parquet copy so later stages don't have to parse the CSV again
+        if pyarrow is not None:
+            parquet_filename = f"final_jobs_{timestamp}.parquet"
+            df.to_parquet(parquet_filename, index=False, compression='zstd')
+            print(f"  - {parquet_filename}")
+        
         return unique_jobs, csv_filename
     else:
         print("No unique jobs to save!")
@@ -191,6 +203,8 @@ def step5_summary(scraped_count, api_count, final_count):
     print(f"  - api_jobs_*.csv (API collected data)")
     print(f"  - final_jobs_*.csv (combined & cleaned data)")
     print(f"  - final_jobs_*.json (same data in JSON format)")
+    if pyarrow is not None:
+        print(f"  - final_jobs_*.parquet (same data, faster to load)")
 
 def main():
     """
@@ -4,6 +4,28 @@ tests local embeds before doing the full process and breaking things
 
 """
 
+import os
+import sys
+import hashlib
+import importlib.metadata
+
+# Remembers the last successful package check so torch isn't imported every run
+PIPELINE_CACHE_FILE = '.pipeline_cache'
+
+def _requirements_key(install_names):
+    """Hash of the python version, platform and installed package versions"""
+    # reading package metadata is cheap, it doesn't import anything
+    versions = [importlib.metadata.version(name) for name in install_names]
+    return hashlib.sha1(f"{sys.version}|{sys.platform}|{'|'.join(versions)}".encode()).hexdigest()
+
+def _probe_import(package_name):
+    """Try importing one package, return True if it loads"""
+    try:
+        __import__(package_name)
+        return True
+    except ImportError:
+        return False
+
 def test_installation():
     """
     Test if all required packages are installed
@@ -17,13 +39,26 @@ def test_installation():
         ('pandas', 'pandas')
     ]
     
+    # Skip the slow imports if nothing changed since the last good check
+    try:
+        cache_key = _requirements_key([install_name for _, install_name in required_packages])
+    except importlib.metadata.PackageNotFoundError:
+        cache_key = None
+    
+    if cache_key and os.path.exists(PIPELINE_CACHE_FILE):
+        with open(PIPELINE_CACHE_FILE, 'r') as f:
+            if f.read().strip() == cache_key:
+                print("All required packages installed! (same as last check)")
+                return True
+    
     missing_packages = []
     
+    # one at a time - sentence_transformers imports torch itself, and importing
+    # both from separate threads can fail halfway or get stuck on the import lock
     for package_name, install_name in required_packages:
-        try:
-            __import__(package_name)
+        if _probe_import(package_name):
             print(f"{package_name} - installed")
-        except ImportError:
+        else:
             print(f"{package_name} - MISSING")
             missing_packages.append(install_name)
     
@@ -33,8 +68,76 @@ def test_installation():
         return False
     
     print("All required packages installed!")
+    
+    if cache_key:
+        try:
+            with open(PIPELINE_CACHE_FILE, 'w') as f:
+                f.write(cache_key)
+        except OSError:
+            pass  # just means the check runs again next time
+    
     return True
 
+class _CountingModel:
+    """Tiny stand-in for a SentenceTransformer that remembers every text it encodes"""
+    max_seq_length = 256
+    
+    def __init__(self):
+        self.encoded = []
+    
+    def get_sentence_embedding_dimension(self):
+        return 3
+    
+    def encode(self, texts, **kwargs):
+        self.encoded.extend(texts)
+        return _unit_rows(texts)
+
+def _unit_rows(texts):
+    """A different unit-length row for each text, based on its length and first letter"""
+    import numpy as np
+    rows = np.array([[len(text), ord(text[0]), 1.0] for text in texts], dtype=np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+def test_embed_batch_order():
+    """
+    Test that embed_batch sends each distinct text through the model once and
+    gives the rows back in the original order, duplicates included
+    """
+    print("\nTesting embed_batch ordering...")
+    
+    try:
+        import numpy as np
+        from embedding_generator import LLMEmbeddingGenerator
+        
+        # skip __init__, it would load the real model
+        generator = LLMEmbeddingGenerator.__new__(LLMEmbeddingGenerator)
+        generator.model = _CountingModel()
+        generator.backend = 'onnx'  # no torch.inference_mode() needed
+        
+        texts = ["b" * 40, "d" * 12, "b" * 40, "c" * 900, "a" * 5, "a" * 5, "c" * 900, "e" * 300]
+        
+        # small batches and token budget so the texts get split and sorted into several batches
+        embeddings = generator.embed_batch(texts, batch_size=2, max_tokens=100)
+        
+        if embeddings.shape != (len(texts), 3) or embeddings.dtype != np.float32:
+            print(f"Wrong shape or type: {embeddings.shape} {embeddings.dtype}")
+            return False
+        
+        if not np.allclose(embeddings, _unit_rows(texts)):
+            print("Embeddings came back in the wrong order")
+            return False
+        
+        if sorted(generator.model.encoded) != sorted(set(texts)):
+            print(f"Model saw {len(generator.model.encoded)} texts, expected {len(set(texts))} distinct ones")
+            return False
+        
+        print("embed_batch keeps the order and skips duplicate texts!")
+        return True
+        
+    except Exception as e:
+        print(f"embed_batch test failed: {e}")
+        return False
+
 def test_model_loading():
     """
     Test loading a small LLM embedding model
@@ -153,6 +256,11 @@ def main():
         print("\nSetup incomplete. Install missing packages first.")
         return
     
+    # Check batching / dedup without the real model
+    if not test_embed_batch_order():
+        print("\nembed_batch is broken.")
+        return
+    
     # Check system info
     check_system_info()
     
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+tests stage 4
+
+checks the matcher's ranking, the int8 embeddings and picking the newest files
+"""
+
+import os
+import time
+import tempfile
+import numpy as np
+from job_matcher import SimpleJobMatcher, quantize_embeddings, cosine_similarities, find_latest_file
+
+def test_top_jobs_order():
+    """Test that the top N jobs come back best first, same as sorting every score"""
+    print("=== Testing Top Jobs Order ===")
+    
+    try:
+        rng = np.random.default_rng(0)
+        matcher = SimpleJobMatcher()
+        
+        # distinct scores first, then lots of ties
+        for scores in [rng.random(500), rng.integers(0, 5, 500) / 4]:
+            matcher.similarities = scores
+            matcher.job_data = [{'title': f'Job {i}'} for i in range(len(scores))]
+            
+            for top_n in [1, 10, 499, 500, 600]:
+                top_jobs = matcher.get_top_jobs(top_n)
+                expected = np.sort(scores)[::-1][:top_n]
+                
+                if [job['similarity_score'] for job in top_jobs] != expected.tolist():
+                    print(f"Wrong scores for top {top_n}")
+                    return False
+                if [job['rank'] for job in top_jobs] != list(range(1, len(expected) + 1)):
+                    print(f"Wrong ranks for top {top_n}")
+                    return False
+                
+                # with distinct scores the jobs themselves have to match too
+                if len(np.unique(scores)) == len(scores):
+                    expected_titles = [f'Job {i}' for i in np.argsort(-scores)[:top_n]]
+                    if [job['title'] for job in top_jobs] != expected_titles:
+                        print(f"Wrong jobs for top {top_n}")
+                        return False
+        
+        print("Top jobs are in the right order!")
+        return True
+    except Exception as e:
+        print(f"Ranking failed: {e}")
+        return False
+
+def test_quantized_embeddings():
+    """Test that int8 embeddings give almost the same cosine scores as float32"""
+    print("\n=== Testing Quantized Embeddings ===")
+    
+    try:
+        rng = np.random.default_rng(1)
+        
+        for dimension in [384, 1536]:
+            jobs = rng.standard_normal((1000, dimension)).astype(np.float32)
+            resume = rng.standard_normal(dimension).astype(np.float32)
+            
+            jobs_i8 = quantize_embeddings(jobs)
+            if jobs_i8.dtype != np.int8 or jobs_i8.shape != jobs.shape:
+                print("Quantized embeddings should be an int8 matrix of the same shape")
+                return False
+            
+            # every row uses the full int8 range
+            if not np.all(np.abs(jobs_i8).max(axis=1) == 127):
+                print("Rows aren't scaled to +-127")
+                return False
+            
+            max_error = np.abs(cosine_similarities(jobs, resume) - cosine_similarities(jobs_i8, resume)).max()
+            print(f"Dimension {dimension}: max cosine error {max_error:.5f}")
+            if max_error > 5e-3:
+                print("int8 cosine scores are too far off")
+                return False
+        
+        # an all-zero row stays zero instead of dividing by zero
+        if quantize_embeddings(np.zeros((1, 8))).any():
+            print("Zero row didn't stay zero")
+            return False
+        
+        print("Quantized embeddings are close enough!")
+        return True
+    except Exception as e:
+        print(f"Quantizing failed: {e}")
+        return False
+
+def test_find_latest_file():
+    """Test that earlier patterns win, and the newest file wins within a pattern"""
+    print("\n=== Testing Finding The Latest File ===")
+    
+    old_dir = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            os.chdir(temp_dir)
+            patterns = [('embeddings_llm_', '.npz'), ('job_embeddings', '.npy')]
+            
+            if find_latest_file(patterns) is not None:
+                print("Found a file in an empty folder")
+                return False
+            
+            for name in ['embeddings_llm_1.npz', 'embeddings_llm_2.npz', 'job_embeddings.npy']:
+                with open(name, 'w') as f:
+                    f.write('x')
+                time.sleep(0.01)  # so the files get different ctimes
+            os.mkdir('embeddings_llm_3.npz')  # folders don't count
+            
+            # the .npy is newest, but .npz files are asked for first
+            found = find_latest_file(patterns)
+            if found != 'embeddings_llm_2.npz':
+                print(f"Expected embeddings_llm_2.npz, got {found}")
+                return False
+            
+            found = find_latest_file(patterns[::-1])
+            if found != 'job_embeddings.npy':
+                print(f"Expected job_embeddings.npy, got {found}")
+                return False
+        
+        print("Latest files found correctly!")
+        return True
+    except Exception as e:
+        print(f"Finding files failed: {e}")
+        return False
+    finally:
+        os.chdir(old_dir)
+
+def main():
+    """Run all tests"""
+    print("Testing Stage 4 Job Matching")
+    
+    order_test_ok = test_top_jobs_order()
+    quantize_test_ok = test_quantized_embeddings()
+    latest_file_test_ok = test_find_latest_file()
+    
+    # Summary
+    print(f"\n=== Test Results ===")
+    print(f"Top jobs order: {'PASS' if order_test_ok else 'FAIL'}")
+    print(f"Quantized embeddings: {'PASS' if quantize_test_ok else 'FAIL'}")
+    print(f"Latest file: {'PASS' if latest_file_test_ok else 'FAIL'}")
+    
+    if order_test_ok and quantize_test_ok and latest_file_test_ok:
+        print("All tests passed! Your Stage 4 is ready.")
+    else:
+        print("Some tests failed. Check the errors above.")
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,10 @@ tests stage 2
 makes fake jobs so that it can clean and check them
 """
 
+import os
 import pandas as pd
-from data_preprocessor import SimpleJobCleaner, ResumeTextCleaner
+from data_preprocessor import SimpleJobCleaner, ResumeTextCleaner, TEXT_COLUMNS, TEXT_DTYPE
+from data_validator import SimpleDataChecker
 
 def create_test_data():
     """Make some fake messy job data to test with"""
@@ -90,6 +92,109 @@ def test_job_cleaning():
     
     return False
 
+def test_all_jobs_filtered_out():
+    """Test cleaning a file where every job gets removed"""
+    print("\n=== Testing All Jobs Filtered Out ===")
+    
+    # the only job has no company, so nothing is left after cleaning
+    test_file = "test_filtered_jobs.csv"
+    pd.DataFrame([{
+        'title': 'Software Engineer',
+        'company': None,
+        'location': 'St. Louis, MO',
+        'description': 'Python developer needed for a long term project.',
+        'url': 'https://jobs.example.com/1',
+        'source': 'Indeed'
+    }]).to_csv(test_file, index=False)
+    
+    try:
+        cleaner = SimpleJobCleaner()
+        if not cleaner.load_jobs(test_file):
+            return False
+        
+        cleaned = cleaner.clean_all_jobs()
+        if cleaned is None or len(cleaned) != 0 or 'clean_text' not in cleaned.columns:
+            print("Expected an empty DataFrame with a clean_text column")
+            return False
+        
+        print("Empty result handled!")
+        return True
+    except Exception as e:
+        print(f"Cleaning failed: {e}")
+        return False
+    finally:
+        os.remove(test_file)
+
+def test_text_dtypes():
+    """Test that cleaning gives the same jobs with object and Arrow string columns"""
+    print("\n=== Testing Text Column Types ===")
+    
+    if TEXT_DTYPE is None:
+        print("pyarrow not installed, only object columns are used")
+        return True
+    
+    # the normal test jobs, then just the bad one so everything gets filtered out
+    fake_jobs = create_test_data()
+    
+    try:
+        for jobs in [fake_jobs, fake_jobs[-1:]]:
+            results = []
+            for dtype in [object, TEXT_DTYPE]:
+                cleaner = SimpleJobCleaner()
+                cleaner.jobs_data = pd.DataFrame(jobs).replace('', None).astype(dict.fromkeys(TEXT_COLUMNS, dtype))
+                cleaned = cleaner.clean_all_jobs()
+                results.append(cleaned.astype(object).where(cleaned.notna(), None).to_dict('records'))
+            
+            if results[0] != results[1]:
+                print("Object and Arrow string columns cleaned differently")
+                return False
+        
+        print("Both column types clean the same!")
+        return True
+    except Exception as e:
+        print(f"Cleaning failed: {e}")
+        return False
+
+def test_big_csv_loading():
+    """Test loading a CSV bigger than one pyarrow block with multi-line descriptions"""
+    print("\n=== Testing Big CSV Loading ===")
+    
+    # scraped descriptions keep their line breaks, ~3MB is a few read blocks
+    num_jobs = 50000
+    df = pd.DataFrame({
+        'title': [f'Developer {i}' for i in range(num_jobs)],
+        'company': ['Acme'] * num_jobs,
+        'location': ['St. Louis, MO'] * num_jobs,
+        'description': [f'Line one of job {i}\nline two\n\nline "three"' for i in range(num_jobs)],
+        'url': [f'https://acme.com/jobs/{i}' for i in range(num_jobs)],
+        'source': ['Indeed'] * num_jobs
+    })
+    
+    test_file = "test_big_jobs.csv"
+    df.to_csv(test_file, index=False)
+    
+    try:
+        cleaner = SimpleJobCleaner()
+        checker = SimpleDataChecker()
+        if not cleaner.load_jobs(test_file) or not checker.load_data(test_file):
+            return False
+        
+        if len(cleaner.jobs_data) != num_jobs or len(checker.data) != num_jobs:
+            print(f"Expected {num_jobs} jobs, got {len(cleaner.jobs_data)} and {len(checker.data)}")
+            return False
+        
+        if cleaner.jobs_data['description'].iloc[-1] != df['description'].iloc[-1]:
+            print("Multi-line description didn't come back the same")
+            return False
+        
+        print("Big CSV loaded!")
+        return True
+    except Exception as e:
+        print(f"Loading failed: {e}")
+        return False
+    finally:
+        os.remove(test_file)
+
 def test_resume_cleaning():
     """Test resume cleaning"""
     print("\n=== Testing Resume Cleaning ===")
@@ -130,15 +235,27 @@ def main():
     # Test job cleaning
     job_test_ok = test_job_cleaning()
     
+    # Test a file where every job gets removed
+    filtered_test_ok = test_all_jobs_filtered_out()
+    
+    # Test object and Arrow string columns
+    dtype_test_ok = test_text_dtypes()
+    
+    # Test loading a big CSV
+    big_csv_test_ok = test_big_csv_loading()
+    
     # Test resume cleaning  
     resume_test_ok = test_resume_cleaning()
     
     # Summary
     print(f"\n=== Test Results ===")
     print(f"Job cleaning: {'PASS' if job_test_ok else 'FAIL'}")
+    print(f"All jobs filtered out: {'PASS' if filtered_test_ok else 'FAIL'}")
+    print(f"Text column types: {'PASS' if dtype_test_ok else 'FAIL'}")
+    print(f"Big CSV loading: {'PASS' if big_csv_test_ok else 'FAIL'}")
     print(f"Resume cleaning: {'PASS' if resume_test_ok else 'FAIL'}")
     
-    if job_test_ok and resume_test_ok:
+    if job_test_ok and filtered_test_ok and dtype_test_ok and big_csv_test_ok and resume_test_ok:
         print("All tests passed! Your Stage 2 is ready.")
         print("Now you can run: python data_preprocessor.py")
     else: